@@ -4,16 +4,22 @@ This module provides a REST API for the Provet application, allowing clients to
 generate discharge notes via HTTP requests.
 """
 
-import json
+import asyncio
 import logging
-from pathlib import Path
+import os
+from collections.abc import AsyncIterator, Awaitable, Iterable
+from contextlib import asynccontextmanager
 from typing import Any
 
-from fastapi import BackgroundTasks, FastAPI, File, HTTPException, UploadFile
+import orjson
+from fastapi import Depends, FastAPI, File, HTTPException, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
-from provet.core.app import create_discharge_note_generator
+from provet.core.app import DischargeNoteGenerator, create_discharge_note_generator
+from provet.core.data_models import ConsultationData
+from provet.utils.config import config_manager
 
 # Configure logging
 logging.basicConfig(
@@ -22,34 +28,116 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder."""
+
+    def render(self, content: Any) -> bytes:
+        """Serialize the response content to JSON bytes.
+
+        Args:
+            content: The response content to serialize.
+
+        Returns:
+            The serialized JSON content.
+        """
+        return orjson.dumps(content)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Create the discharge note generator for the application's lifetime.
+
+    The generator is created and its OpenAI connection warmed up when the
+    application starts, and its connections are released on shutdown. A
+    failed warm-up is logged and does not prevent startup. The configuration
+    is frozen once the generator has been created. The semaphore
+    limiting concurrent OpenAI calls for batch requests is created here too,
+    sized from the configured max_concurrency.
+
+    Args:
+        app: The FastAPI application.
+    """
+    generator = create_discharge_note_generator()
+    # The services have copied their settings, so later changes would not
+    # reach them; freezing turns such changes into errors
+    config_manager.freeze()
+    app.state.discharge_generator = generator
+    app.state.batch_semaphore = asyncio.Semaphore(config_manager.get("max_concurrency"))
+    try:
+        await generator.warmup()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not warm up the OpenAI connection: {e}")
+
+    yield
+
+    await generator.close()
+
+
+def get_discharge_generator(request: Request) -> DischargeNoteGenerator:
+    """Get the application's discharge note generator.
+
+    Args:
+        request: The incoming request.
+
+    Returns:
+        The generator created by the application's lifespan.
+    """
+    return request.app.state.discharge_generator
+
+
+def get_batch_semaphore(request: Request) -> asyncio.Semaphore:
+    """Get the semaphore limiting concurrent OpenAI calls for batch requests.
+
+    Args:
+        request: The incoming request.
+
+    Returns:
+        The semaphore created by the application's lifespan.
+    """
+    return request.app.state.batch_semaphore
+
+
 # Create FastAPI application
 app = FastAPI(
     title="Provet API",
     description="API for generating veterinary discharge notes",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-# Add CORS middleware
+# Add CORS middleware for a comma-separated allowlist of origins
+ALLOWED_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv(
+        "ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:8000"
+    ).split(",")
+    if origin.strip()
+]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, limit this to specific origins
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
 )
 
-# Create Provet generator
-discharge_generator = create_discharge_note_generator()
+# Uploads are read in fixed-size chunks and capped in size
+UPLOAD_CHUNK_SIZE = 64 * 1024
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", str(10 * 1024 * 1024)))
 
-# Create temporary directory for file uploads
-UPLOAD_DIR = Path("temp_uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "100"))
 
 
 class ConsultationRequest(BaseModel):
-    """Request model for consultation data."""
+    """Request model for consultation data.
+
+    The consultation data is validated into the application's data model
+    while the request body is parsed, so it is not validated a second time.
+    """
 
-    consultation_data: dict[str, Any] = Field(
+    consultation_data: ConsultationData = Field(
         ..., description="JSON consultation data for discharge note generation"
     )
 
@@ -60,6 +148,15 @@ class DischargeNoteResponse(BaseModel):
     discharge_note: str = Field(..., description="Generated discharge note")
 
 
+class BatchItemResponse(BaseModel):
+    """Response model for one consultation in a batch."""
+
+    discharge_note: str | None = Field(
+        None, description="Generated discharge note, if generation succeeded"
+    )
+    error: str | None = Field(None, description="Error message, if generation failed")
+
+
 @app.get("/")
 async def root() -> dict[str, str]:
     """Health check endpoint.
@@ -73,11 +170,13 @@ async def root() -> dict[str, str]:
 @app.post("/generate", response_model=DischargeNoteResponse)
 async def generate_discharge_note(
     request: ConsultationRequest,
+    discharge_generator: DischargeNoteGenerator = Depends(get_discharge_generator),
 ) -> DischargeNoteResponse:
     """Generate a discharge note from consultation data.
 
     Args:
         request: Consultation data for discharge note generation.
+        discharge_generator: Generator used to produce the note.
 
     Returns:
         DischargeNoteResponse containing the generated discharge note.
@@ -88,42 +187,197 @@ async def generate_discharge_note(
     try:
         logger.info("🔍 Received request to generate discharge note")
 
-        # Create a temp file to store the consultation data
-        temp_file = UPLOAD_DIR / f"consultation_{id(request)}.json"
-        try:
-            with temp_file.open("w") as f:
-                json.dump(request.consultation_data, f)
+        discharge_note = await discharge_generator.process_dict(
+            request.consultation_data
+        )
+
+        return DischargeNoteResponse(discharge_note=discharge_note)
+
+    except Exception as e:
+        logger.error(f"❌ Error generating discharge note: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 
-            # Process the file with the discharge note generator
-            output_path = discharge_generator.process_file(temp_file)
+@app.post("/batch", response_model=list[BatchItemResponse])
+async def generate_discharge_notes(
+    requests: list[ConsultationRequest],
+    discharge_generator: DischargeNoteGenerator = Depends(get_discharge_generator),
+    batch_semaphore: asyncio.Semaphore = Depends(get_batch_semaphore),
+) -> list[BatchItemResponse]:
+    """Generate discharge notes for several consultations concurrently.
 
-            # Read the generated discharge note
-            output_path = Path(output_path)
-            with output_path.open("r") as f:
-                output_data = json.load(f)
+    At most OPENAI_MAX_CONCURRENCY notes are generated at once across all
+    batch requests, and at most MAX_BATCH_SIZE consultations are accepted. A
+    failure for one consultation does not fail the batch; its result carries
+    the error message instead of a note.
 
-            return DischargeNoteResponse(discharge_note=output_data["discharge_note"])
-        finally:
-            # Clean up temporary files
-            if temp_file.exists():
-                temp_file.unlink()
-            if output_path.exists():
-                output_path.unlink()
+    Args:
+        requests: Consultation data for each discharge note to generate.
+        discharge_generator: Generator used to produce the notes.
+        batch_semaphore: Semaphore limiting concurrent OpenAI calls.
+
+    Returns:
+        One BatchItemResponse per consultation, in request order.
+    """
+    logger.info(f"🔍 Received request to generate {len(requests)} discharge notes")
+    check_batch_size(len(requests))
+
+    return await run_batch(
+        (
+            discharge_generator.process_dict(request.consultation_data)
+            for request in requests
+        ),
+        batch_semaphore,
+    )
+
+
+@app.post("/upload_batch", response_model=list[BatchItemResponse])
+async def upload_consultation_files(
+    files: list[UploadFile] = File(...),
+    discharge_generator: DischargeNoteGenerator = Depends(get_discharge_generator),
+    batch_semaphore: asyncio.Semaphore = Depends(get_batch_semaphore),
+) -> list[BatchItemResponse]:
+    """Generate discharge notes for several uploaded JSON files concurrently.
+
+    Files are processed like uploads to "/upload", sharing the concurrency
+    limit of "/batch". A file that can't be processed does not fail the
+    batch; its result carries the error message instead of a note.
+
+    Args:
+        files: Uploaded JSON files containing consultation data.
+        discharge_generator: Generator used to produce the notes.
+        batch_semaphore: Semaphore limiting concurrent OpenAI calls.
+
+    Returns:
+        One BatchItemResponse per file, in upload order.
+    """
+    logger.info(f"📤 Received upload of {len(files)} files")
+    check_batch_size(len(files))
+
+    async def generate(file: UploadFile) -> str:
+        if not file.filename.endswith(".json"):
+            raise HTTPException(status_code=400, detail="Only JSON files are supported")
+        consultation_data = orjson.loads(await read_upload(file))
+        return await discharge_generator.process_dict(consultation_data)
+
+    return await run_batch((generate(file) for file in files), batch_semaphore)
+
+
+def check_batch_size(size: int) -> None:
+    """Reject batches larger than MAX_BATCH_SIZE.
+
+    Args:
+        size: Number of items in the batch.
+
+    Raises:
+        HTTPException: If the batch is too large.
+    """
+    if size > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds the limit of {MAX_BATCH_SIZE} consultations",
+        )
+
+
+async def run_batch(
+    jobs: Iterable[Awaitable[str]], semaphore: asyncio.Semaphore
+) -> list[BatchItemResponse]:
+    """Run discharge note generations concurrently within the batch limit.
+
+    At most OPENAI_MAX_CONCURRENCY jobs run at once across all batches
+    sharing the semaphore.
+
+    Args:
+        jobs: Awaitables that each produce one discharge note.
+        semaphore: Semaphore limiting concurrent OpenAI calls.
+
+    Returns:
+        One BatchItemResponse per job, in order, with the note or the error.
+    """
+
+    async def run(job: Awaitable[str]) -> str:
+        async with semaphore:
+            return await job
+
+    results = await asyncio.gather(*(run(job) for job in jobs), return_exceptions=True)
+
+    responses = []
+    for result in results:
+        if isinstance(result, Exception):
+            error = result.detail if isinstance(result, HTTPException) else str(result)
+            logger.error(f"❌ Error generating discharge note: {error}")
+            responses.append(BatchItemResponse(error=error))
+        else:
+            responses.append(BatchItemResponse(discharge_note=result))
+    return responses
+
+
+@app.post("/generate/stream")
+async def stream_discharge_note(
+    request: ConsultationRequest,
+    discharge_generator: DischargeNoteGenerator = Depends(get_discharge_generator),
+) -> StreamingResponse:
+    """Stream a discharge note from consultation data as server-sent events.
+
+    Each event carries a JSON object with the next fragment of the note in
+    its "delta" field. If generation fails mid-stream, an "error" event with
+    the error message is sent instead.
+
+    Args:
+        request: Consultation data for discharge note generation.
+        discharge_generator: Generator used to produce the note.
+
+    Returns:
+        StreamingResponse emitting the discharge note as it is generated.
+
+    Raises:
+        HTTPException: If the consultation data can't be processed.
+    """
+    try:
+        logger.info("🔍 Received request to stream discharge note")
+
+        fragments = discharge_generator.stream_dict(request.consultation_data)
 
     except Exception as e:
         logger.error(f"❌ Error generating discharge note: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    return StreamingResponse(
+        to_server_sent_events(fragments), media_type="text/event-stream"
+    )
+
+
+async def to_server_sent_events(fragments: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """Encode discharge note fragments as server-sent events.
+
+    Args:
+        fragments: Async iterator over fragments of a discharge note.
+
+    Yields:
+        Encoded server-sent events.
+    """
+    try:
+        async for fragment in fragments:
+            yield b"data: " + orjson.dumps({"delta": fragment}) + b"\n\n"
+    except Exception as e:
+        logger.error(f"❌ Error streaming discharge note: {e}")
+        yield b"event: error\ndata: " + orjson.dumps({"detail": str(e)}) + b"\n\n"
+
 
 @app.post("/upload", response_model=DischargeNoteResponse)
 async def upload_consultation_file(
-    file: UploadFile = File(...), background_tasks: BackgroundTasks = None
+    file: UploadFile = File(...),
+    discharge_generator: DischargeNoteGenerator = Depends(get_discharge_generator),
 ) -> DischargeNoteResponse:
     """Generate a discharge note from an uploaded JSON file.
 
+    The upload is parsed from the server's spooled temporary file, which
+    only spills to disk for large uploads, instead of being copied to a
+    directory of its own.
+
     Args:
         file: Uploaded JSON file containing consultation data.
-        background_tasks: Background tasks for cleanup.
+        discharge_generator: Generator used to produce the note.
 
     Returns:
         DischargeNoteResponse containing the generated discharge note.
@@ -138,48 +392,60 @@ async def upload_consultation_file(
         if not file.filename.endswith(".json"):
             raise HTTPException(status_code=400, detail="Only JSON files are supported")
 
-        # Save the uploaded file
-        file_path = UPLOAD_DIR / file.filename
-        with file_path.open("wb") as f:
-            content = await file.read()
-            f.write(content)
-
-        # Process the file with the discharge note generator
-        output_path = discharge_generator.process_file(file_path)
-
-        # Read the generated discharge note
-        output_path = Path(output_path)
-        with output_path.open("r") as f:
-            output_data = json.load(f)
+        # Parse the uploaded file
+        try:
+            consultation_data = orjson.loads(await read_upload(file))
+        except orjson.JSONDecodeError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON file: {e}")
 
-        # Add cleanup to background tasks
-        if background_tasks:
-            background_tasks.add_task(cleanup_files, file_path, output_path)
+        # Process the data with the discharge note generator
+        discharge_note = await discharge_generator.process_dict(consultation_data)
 
-        return DischargeNoteResponse(discharge_note=output_data["discharge_note"])
+        return DischargeNoteResponse(discharge_note=discharge_note)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Error processing uploaded file: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def cleanup_files(input_path: Path, output_path: Path) -> None:
-    """Clean up temporary files.
+async def read_upload(file: UploadFile) -> bytes:
+    """Read an uploaded file in chunks, enforcing the upload size limit.
 
     Args:
-        input_path: Path to the input file.
-        output_path: Path to the output file.
+        file: Uploaded file to read.
+
+    Returns:
+        The contents of the file.
+
+    Raises:
+        HTTPException: If the upload is larger than MAX_UPLOAD_SIZE.
     """
-    try:
-        if input_path.exists():
-            input_path.unlink()
-        if output_path.exists():
-            output_path.unlink()
-    except Exception as e:
-        logger.error(f"❌ Error cleaning up files: {e}")
+    chunks = []
+    size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > MAX_UPLOAD_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File exceeds the {MAX_UPLOAD_SIZE} byte upload limit",
+            )
+        chunks.append(chunk)
+    return b"".join(chunks)
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    # Hot reloading only works with a single worker, so keep it for debugging
+    debug = os.getenv("DEBUG", "false").lower() == "true"
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=1 if debug else int(os.getenv("WEB_CONCURRENCY", "4")),
+        reload=debug,
+    )
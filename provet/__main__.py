@@ -6,31 +6,105 @@ from the command line.
 """
 
 import argparse
+import asyncio
+import functools
 import sys
 from pathlib import Path
 
-from provet.core.app import create_discharge_note_generator
 
+@functools.cache
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser.
 
-def parse_args() -> argparse.Namespace:
-    """Parse command-line arguments.
+    The parser is built on first use and reused afterwards.
 
     Returns:
-        Parsed argument namespace.
+        Argument parser for the command-line interface.
     """
     parser = argparse.ArgumentParser(
         description="Generate a discharge note from consultation data."
     )
     parser.add_argument(
-        "file", help="Path to a JSON file containing consultation data."
+        "file",
+        nargs="+",
+        help="Paths to JSON files containing consultation data, or to "
+        "directories whose JSON files are all processed.",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit the files as one OpenAI batch job: half the cost, but "
+        "results may take up to 24 hours.",
     )
     parser.add_argument(
         "--output-dir",
         help="Directory to save the output file (default: ./solution)",
         type=Path,
     )
+    return parser
 
-    return parser.parse_args()
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Returns:
+        Parsed argument namespace.
+    """
+    return build_parser().parse_args()
+
+
+def expand_paths(paths: list[str]) -> list[str]:
+    """Replace directories with the JSON files they contain.
+
+    Args:
+        paths: Paths to JSON files or directories given on the command line.
+
+    Returns:
+        File paths in command-line order, with each directory's JSON files
+        sorted by name.
+
+    Raises:
+        ValueError: If a directory contains no JSON files.
+    """
+    file_paths = []
+    for path in paths:
+        if Path(path).is_dir():
+            json_files = sorted(Path(path).glob("*.json"))
+            if not json_files:
+                raise ValueError(f"❌ No JSON files found in {path}")
+            file_paths.extend(str(file) for file in json_files)
+        else:
+            file_paths.append(path)
+    return file_paths
+
+
+async def generate(file_paths: list[str], batch: bool = False) -> list[str]:
+    """Generate discharge notes for consultation data files.
+
+    The files are processed concurrently, so a run over many files is not
+    serialized on the language model's response time.
+
+    Args:
+        file_paths: Paths to the JSON files containing consultation data.
+        batch: Whether to submit the files as one OpenAI batch job.
+
+    Returns:
+        Paths to the saved discharge note files, in input order.
+    """
+    # Deferred so that ``--help`` and argument errors don't pay for importing
+    # OpenAI, httpx and Jinja2.
+    from provet.core.app import create_discharge_note_generator
+    from provet.utils.config import config_manager
+
+    generator = create_discharge_note_generator()
+    # The services have copied their settings; reject any later changes
+    config_manager.freeze()
+    try:
+        if batch:
+            return await generator.process_files_batch(file_paths)
+        return await generator.process_files(file_paths)
+    finally:
+        await generator.close()
 
 
 def main() -> int:
@@ -42,13 +116,13 @@ def main() -> int:
     args = parse_args()
 
     try:
-        # Create discharge note generator
-        generator = create_discharge_note_generator()
-
-        # Process file
-        output_path = generator.process_file(args.file)
+        # Process files
+        output_paths = asyncio.run(generate(expand_paths(args.file), args.batch))
 
-        print(f"✅ Discharge note successfully generated and saved to {output_path} 📄")
+        for output_path in output_paths:
+            print(
+                f"✅ Discharge note successfully generated and saved to {output_path} 📄"
+            )
         return 0
     except Exception as e:
         print(f"❌ Error: {e}", file=sys.stderr)
@@ -4,11 +4,17 @@ This module provides a high-level interface for the application, hiding the
 complexity of the underlying components.
 """
 
+import asyncio
+from collections.abc import AsyncIterator
 from pathlib import Path
+from typing import Any
 
+from provet.core.batch_service import create_batch_service
+from provet.core.data_models import ConsultationData
 from provet.core.io_manager import IOManager
 from provet.core.llm_service import create_llm_service
-from provet.utils.template_engine import TemplateEngine
+from provet.utils.config import config_manager
+from provet.utils.template_engine import get_template_engine
 
 
 class DischargeNoteGenerator:
@@ -20,18 +26,23 @@ class DischargeNoteGenerator:
     Attributes:
         io_manager: Manager for file I/O operations.
         llm_service: Service for interacting with language models.
+        batch_service: Service for generating notes with the Batch API.
         template_engine: Engine for rendering templates.
     """
 
     def __init__(self) -> None:
         """Initialize the discharge note generator."""
-        self.template_engine = TemplateEngine()
+        self.template_engine = get_template_engine()
         self.llm_service = create_llm_service(self.template_engine)
+        self.batch_service = create_batch_service(self.llm_service)
         self.io_manager = IOManager()
 
-    def process_file(self, file_path: str | Path) -> str:
+    async def process_file(self, file_path: str | Path) -> str:
         """Process a consultation data file and generate a discharge note.
 
+        File I/O runs in a worker thread so the event loop stays free while
+        the note is generated.
+
         Args:
             file_path: Path to the JSON file containing consultation data.
 
@@ -44,21 +55,179 @@ class DischargeNoteGenerator:
         """
         try:
             # Load consultation data
-            consultation_data = self.io_manager.load_consultation_data(file_path)
+            consultation_data = await asyncio.to_thread(
+                self.io_manager.load_consultation_data, file_path
+            )
 
             # Generate template context
             context = consultation_data.to_template_context()
 
             # Generate discharge note
-            discharge_note = self.llm_service.generate_discharge_note(context)
+            discharge_note = await self.llm_service.generate_discharge_note(context)
 
             # Save discharge note
-            output_path = self.io_manager.save_discharge_note(discharge_note, file_path)
+            output_path = await asyncio.to_thread(
+                self.io_manager.save_discharge_note, discharge_note, file_path
+            )
 
             return str(output_path)
         except Exception as e:
             raise ValueError(f"❌ Error processing file {file_path}: {e}")
 
+    async def process_files(self, file_paths: list[str | Path]) -> list[str]:
+        """Process several consultation data files concurrently.
+
+        Requests to the language model overlap, but at most
+        OPENAI_MAX_CONCURRENCY files are processed at once to stay within
+        the account's rate limits. A file that fails does not stop the
+        others: every note that could be generated is saved before the
+        failures are reported.
+
+        Args:
+            file_paths: Paths to JSON files containing consultation data.
+
+        Returns:
+            Paths to the saved discharge note files, in input order.
+
+        Raises:
+            ValueError: If any of the files couldn't be processed, naming
+                each of them.
+        """
+        semaphore = asyncio.Semaphore(config_manager.get("max_concurrency"))
+
+        async def process(path: str | Path) -> str:
+            async with semaphore:
+                return await self.process_file(path)
+
+        results = await asyncio.gather(
+            *(process(path) for path in file_paths), return_exceptions=True
+        )
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise ValueError(
+                f"❌ Failed to process {len(errors)} of {len(file_paths)} files:\n"
+                + "\n".join(str(error) for error in errors)
+            )
+        return list(results)
+
+    async def process_files_batch(
+        self, file_paths: list[str | Path], poll_interval: float = 30.0
+    ) -> list[str]:
+        """Process several consultation data files as one OpenAI batch job.
+
+        The Batch API costs half as much as individual requests but may take
+        up to 24 hours, so this suits offline bulk runs. Notes that were
+        generated are saved even if others failed.
+
+        Args:
+            file_paths: Paths to JSON files containing consultation data.
+            poll_interval: Seconds to wait between batch status checks.
+
+        Returns:
+            Paths to the saved discharge note files, in input order.
+
+        Raises:
+            FileNotFoundError: If a file doesn't exist.
+            ValueError: If the batch fails or a note couldn't be generated.
+        """
+        consultations = await asyncio.gather(
+            *(
+                asyncio.to_thread(self.io_manager.load_consultation_data, path)
+                for path in file_paths
+            )
+        )
+        notes = await self.batch_service.generate_discharge_notes(
+            [data.to_template_context() for data in consultations], poll_interval
+        )
+
+        output_paths = []
+        failed = []
+        for file_path, discharge_note in zip(file_paths, notes, strict=True):
+            if discharge_note is None:
+                failed.append(str(file_path))
+                continue
+            output_path = await asyncio.to_thread(
+                self.io_manager.save_discharge_note, discharge_note, file_path
+            )
+            output_paths.append(str(output_path))
+
+        if failed:
+            raise ValueError(f"❌ No discharge note generated for {', '.join(failed)}")
+        return output_paths
+
+    async def process_dict(self, data: ConsultationData | dict[str, Any]) -> str:
+        """Generate a discharge note from in-memory consultation data.
+
+        Unlike process_file, nothing is read from or written to disk.
+
+        Args:
+            data: Consultation data, either already validated or as a
+                dictionary.
+
+        Returns:
+            The generated discharge note.
+
+        Raises:
+            ValueError: If there's an error processing the data.
+        """
+        try:
+            consultation_data = self._to_consultation_data(data)
+            context = consultation_data.to_template_context()
+            return await self.llm_service.generate_discharge_note(context)
+        except Exception as e:
+            raise ValueError(f"❌ Error processing consultation data: {e}")
+
+    def stream_dict(
+        self, data: ConsultationData | dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Stream a discharge note for in-memory consultation data.
+
+        The data is validated before this returns, so invalid input fails
+        before any output has been streamed.
+
+        Args:
+            data: Consultation data, either already validated or as a
+                dictionary.
+
+        Returns:
+            Async iterator over fragments of the generated discharge note.
+
+        Raises:
+            ValueError: If the consultation data is invalid.
+        """
+        try:
+            consultation_data = self._to_consultation_data(data)
+        except Exception as e:
+            raise ValueError(f"❌ Error processing consultation data: {e}")
+        context = consultation_data.to_template_context()
+        return self.llm_service.stream_discharge_note(context)
+
+    async def warmup(self) -> None:
+        """Prepare the underlying services to handle the first request quickly."""
+        await self.llm_service.warmup()
+
+    async def close(self) -> None:
+        """Release the connections held by the underlying services."""
+        await self.llm_service.close()
+
+    @staticmethod
+    def _to_consultation_data(
+        data: ConsultationData | dict[str, Any],
+    ) -> ConsultationData:
+        """Validate consultation data unless it already is a model.
+
+        Args:
+            data: Consultation data, either already validated or as a
+                dictionary.
+
+        Returns:
+            Validated consultation data.
+        """
+        if isinstance(data, ConsultationData):
+            return data
+        return ConsultationData.from_dict(data)
+
 
 # Factory function to create DischargeNoteGenerator instances
 def create_discharge_note_generator() -> DischargeNoteGenerator:
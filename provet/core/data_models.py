@@ -4,12 +4,21 @@ This module defines structured data models for consultation information,
 facilitating type checking and data validation.
 """
 
-from dataclasses import dataclass, field
 from typing import Any
 
+from pydantic import BaseModel, ConfigDict, Field
 
-@dataclass
-class Patient:
+
+class _Model(BaseModel):
+    """Base class for the data models.
+
+    Models are immutable and ignore fields they don't declare.
+    """
+
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+
+class Patient(_Model):
     """Patient information model.
 
     Attributes:
@@ -23,18 +32,17 @@ class Patient:
         microchip: The patient's microchip number, if available.
     """
 
-    name: str
-    species: str
-    breed: str
-    gender: str
-    neutered: bool
-    date_of_birth: str
-    weight: str
+    name: str = ""
+    species: str = ""
+    breed: str = ""
+    gender: str = ""
+    neutered: bool = False
+    date_of_birth: str = ""
+    weight: str = ""
     microchip: str | None = None
 
 
-@dataclass
-class ClinicalNote:
+class ClinicalNote(_Model):
     """Clinical note model.
 
     Attributes:
@@ -42,12 +50,11 @@ class ClinicalNote:
         type: The type of note (e.g., "general", "assessment").
     """
 
-    note: str
+    note: str = ""
     type: str = "general"
 
 
-@dataclass
-class Procedure:
+class Procedure(_Model):
     """Medical procedure model.
 
     Attributes:
@@ -60,7 +67,7 @@ class Procedure:
         currency: The currency code for the price.
     """
 
-    name: str
+    name: str = ""
     date: str | None = None
     time: str | None = None
     code: str | None = None
@@ -69,8 +76,7 @@ class Procedure:
     currency: str | None = None
 
 
-@dataclass
-class Medicine:
+class Medicine(_Model):
     """Medicine model.
 
     Attributes:
@@ -79,13 +85,12 @@ class Medicine:
         instructions: Instructions for administering the medicine.
     """
 
-    name: str
+    name: str = ""
     dosage: str | None = None
     instructions: str | None = None
 
 
-@dataclass
-class Prescription:
+class Prescription(_Model):
     """Prescription model.
 
     Attributes:
@@ -95,14 +100,13 @@ class Prescription:
         duration: The duration for which the prescription should be taken.
     """
 
-    name: str
+    name: str = ""
     dosage: str | None = None
     instructions: str | None = None
     duration: str | None = None
 
 
-@dataclass
-class Diagnostic:
+class Diagnostic(_Model):
     """Diagnostic test model.
 
     Attributes:
@@ -111,13 +115,12 @@ class Diagnostic:
         notes: Additional notes about the diagnostic test.
     """
 
-    name: str
+    name: str = ""
     result: str | None = None
     notes: str | None = None
 
 
-@dataclass
-class TreatmentItems:
+class TreatmentItems(_Model):
     """Treatment items model.
 
     Attributes:
@@ -128,15 +131,14 @@ class TreatmentItems:
         supplies: List of supplies provided.
     """
 
-    procedures: list[Procedure] = field(default_factory=list)
-    medicines: list[Medicine] = field(default_factory=list)
-    prescriptions: list[Prescription] = field(default_factory=list)
-    foods: list[dict[str, Any]] = field(default_factory=list)
-    supplies: list[dict[str, Any]] = field(default_factory=list)
+    procedures: list[Procedure] = Field(default_factory=list)
+    medicines: list[Medicine] = Field(default_factory=list)
+    prescriptions: list[Prescription] = Field(default_factory=list)
+    foods: list[dict[str, Any]] = Field(default_factory=list)
+    supplies: list[dict[str, Any]] = Field(default_factory=list)
 
 
-@dataclass
-class Consultation:
+class Consultation(_Model):
     """Consultation model.
 
     Attributes:
@@ -149,17 +151,16 @@ class Consultation:
         diagnostics: List of diagnostic tests performed.
     """
 
-    date: str
-    time: str
-    reason: str
-    type: str
-    clinical_notes: list[ClinicalNote] = field(default_factory=list)
-    treatment_items: TreatmentItems = field(default_factory=TreatmentItems)
-    diagnostics: list[Diagnostic] = field(default_factory=list)
+    date: str = ""
+    time: str = ""
+    reason: str = ""
+    type: str = ""
+    clinical_notes: list[ClinicalNote] = Field(default_factory=list)
+    treatment_items: TreatmentItems = Field(default_factory=TreatmentItems)
+    diagnostics: list[Diagnostic] = Field(default_factory=list)
 
 
-@dataclass
-class ConsultationData:
+class ConsultationData(_Model):
     """Complete consultation data model.
 
     Attributes:
@@ -167,8 +168,8 @@ class ConsultationData:
         consultation: Consultation details.
     """
 
-    patient: Patient
-    consultation: Consultation
+    patient: Patient = Field(default_factory=Patient)
+    consultation: Consultation = Field(default_factory=Consultation)
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "ConsultationData":
@@ -178,103 +179,13 @@ class ConsultationData:
             data: Dictionary containing consultation data.
 
         Returns:
-            ConsultationData object populated with the data.
+            ConsultationData object populated with the data. Missing fields
+            take their default values.
+
+        Raises:
+            ValidationError: If a field has a value of the wrong type.
         """
-        patient_data = data.get("patient", {})
-        patient = Patient(
-            name=patient_data.get("name", ""),
-            species=patient_data.get("species", ""),
-            breed=patient_data.get("breed", ""),
-            gender=patient_data.get("gender", ""),
-            neutered=patient_data.get("neutered", False),
-            date_of_birth=patient_data.get("date_of_birth", ""),
-            weight=patient_data.get("weight", ""),
-            microchip=patient_data.get("microchip"),
-        )
-
-        consultation_data = data.get("consultation", {})
-
-        # Process clinical notes
-        clinical_notes = []
-        for note_data in consultation_data.get("clinical_notes", []):
-            clinical_notes.append(
-                ClinicalNote(
-                    note=note_data.get("note", ""),
-                    type=note_data.get("type", "general"),
-                )
-            )
-
-        # Process treatment items
-        treatment_items_data = consultation_data.get("treatment_items", {})
-
-        # Process procedures
-        procedures = []
-        for proc_data in treatment_items_data.get("procedures", []):
-            procedures.append(
-                Procedure(
-                    name=proc_data.get("name", ""),
-                    date=proc_data.get("date"),
-                    time=proc_data.get("time"),
-                    code=proc_data.get("code"),
-                    quantity=proc_data.get("quantity", 1),
-                    total_price=proc_data.get("total_price"),
-                    currency=proc_data.get("currency"),
-                )
-            )
-
-        # Process medicines
-        medicines = []
-        for med_data in treatment_items_data.get("medicines", []):
-            medicines.append(
-                Medicine(
-                    name=med_data.get("name", ""),
-                    dosage=med_data.get("dosage"),
-                    instructions=med_data.get("instructions"),
-                )
-            )
-
-        # Process prescriptions
-        prescriptions = []
-        for rx_data in treatment_items_data.get("prescriptions", []):
-            prescriptions.append(
-                Prescription(
-                    name=rx_data.get("name", ""),
-                    dosage=rx_data.get("dosage"),
-                    instructions=rx_data.get("instructions"),
-                    duration=rx_data.get("duration"),
-                )
-            )
-
-        treatment_items = TreatmentItems(
-            procedures=procedures,
-            medicines=medicines,
-            prescriptions=prescriptions,
-            foods=treatment_items_data.get("foods", []),
-            supplies=treatment_items_data.get("supplies", []),
-        )
-
-        # Process diagnostics
-        diagnostics = []
-        for diag_data in consultation_data.get("diagnostics", []):
-            diagnostics.append(
-                Diagnostic(
-                    name=diag_data.get("name", ""),
-                    result=diag_data.get("result"),
-                    notes=diag_data.get("notes"),
-                )
-            )
-
-        consultation = Consultation(
-            date=consultation_data.get("date", ""),
-            time=consultation_data.get("time", ""),
-            reason=consultation_data.get("reason", ""),
-            type=consultation_data.get("type", ""),
-            clinical_notes=clinical_notes,
-            treatment_items=treatment_items,
-            diagnostics=diagnostics,
-        )
-
-        return cls(patient=patient, consultation=consultation)
+        return cls.model_validate(data)
 
     def to_template_context(self) -> dict[str, Any]:
         """Convert the consultation data to a template context dictionary.
@@ -4,9 +4,10 @@ This module provides functionality for loading consultation data from files
 and saving discharge notes to files.
 """
 
-import json
 from pathlib import Path
 
+import orjson
+
 from provet.core.data_models import ConsultationData
 from provet.utils.config import config_manager
 
@@ -34,12 +35,11 @@ class IOManager:
         """
         path = Path(file_path)
         try:
-            with path.open("r") as f:
-                raw_data = json.load(f)
+            raw_data = orjson.loads(path.read_bytes())
             return ConsultationData.from_dict(raw_data)
         except FileNotFoundError:
             raise FileNotFoundError(f"🔍 File {file_path} not found.")
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             raise ValueError(f"📋 File {file_path} contains invalid JSON.")
         except Exception as e:
             raise ValueError(f"❌ Error loading consultation data: {e}")
@@ -77,8 +77,9 @@ class IOManager:
 
         # Save the output
         try:
-            with output_path.open("w") as f:
-                json.dump(output_data, f, indent=4)
+            output_path.write_bytes(
+                orjson.dumps(output_data, option=orjson.OPT_INDENT_2)
+            )
             return output_path
         except Exception as e:
             raise ValueError(f"❌ Error saving discharge note: {e}")
@@ -4,12 +4,15 @@ This module provides a service for interacting with language models to generate
 discharge notes based on consultation data.
 """
 
-from typing import Any
+from collections.abc import AsyncIterator
+from typing import Any, Self
 
+import httpx
 import openai
 
+from provet.core.response_cache import ResponseCache, make_cache_key, response_cache
 from provet.utils.config import config_manager
-from provet.utils.template_engine import TemplateEngine
+from provet.utils.template_engine import TemplateRenderer, get_template_engine
 
 
 class LLMService:
@@ -19,24 +22,150 @@ class LLMService:
     OpenAI's language models.
 
     Attributes:
-        client: OpenAI client instance.
+        http_client: HTTP/2 connection pool shared by all OpenAI requests.
+        client: Asynchronous OpenAI client instance.
         template_engine: Template engine for rendering prompts.
+        cache: Cache of previously generated discharge notes.
+        model: Name of the model used for completions.
+        temperature: Sampling temperature for completions.
+        max_tokens: Maximum number of tokens to generate.
+        custom_instruction: Additional instruction for the system prompt.
     """
 
-    def __init__(self, template_engine: TemplateEngine | None = None) -> None:
+    def __init__(
+        self,
+        template_engine: TemplateRenderer | None = None,
+        cache: ResponseCache | None = None,
+    ) -> None:
         """Initialize the LLM service.
 
         Args:
             template_engine: Template engine instance for rendering prompts.
-                If not provided, a new instance will be created.
+                If not provided, the process-wide engine is used.
+            cache: Response cache to use. If not provided, the process-wide
+                cache is used.
         """
-        # Initialize OpenAI client
-        self.client = openai.OpenAI(api_key=config_manager.get("api_key"))
+        # Initialize OpenAI client on a pooled HTTP/2 connection, so
+        # concurrent requests share one TLS session instead of opening more.
+        # The client retries rate limits, timeouts, connection and server
+        # errors with jittered exponential backoff, honouring Retry-After.
+        # Connecting gets a short timeout so an unreachable API fails fast.
+        self.http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=100),
+            timeout=httpx.Timeout(60.0, connect=5.0),
+        )
+        self.client = openai.AsyncOpenAI(
+            api_key=config_manager.get("api_key"),
+            http_client=self.http_client,
+            max_retries=config_manager.get("max_retries"),
+        )
 
         # Initialize template engine
-        self.template_engine = template_engine or TemplateEngine()
+        self.template_engine = template_engine or get_template_engine()
+
+        # Initialize response cache
+        self.cache = cache or response_cache
+
+        # Read the request settings once; they do not change after startup
+        self.model = config_manager.get("model")
+        self.temperature = config_manager.get("temperature")
+        self.max_tokens = config_manager.get("max_tokens")
+        self.custom_instruction = config_manager.get("custom_instruction", "")
+
+        # Pre-render the system message, which depends only on configuration.
+        # The message dict is shared by all requests and must not be mutated.
+        self._system_message = {
+            "role": "system",
+            "content": self.template_engine.render_template(
+                "system_message.j2", {"custom_instruction": self.custom_instruction}
+            ),
+        }
+
+        # Completion arguments that are the same for every request
+        self._completion_kwargs = {
+            "model": self.model,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+        }
+
+    async def warmup(self) -> None:
+        """Open a connection to the OpenAI API ahead of the first request.
+
+        Retrieves the configured model, which costs no tokens, so the TLS and
+        HTTP/2 handshakes are done before a user waits on them.
+        """
+        await self.client.models.retrieve(self.model)
+
+    async def close(self) -> None:
+        """Close the HTTP connection pool used for OpenAI requests."""
+        await self.http_client.aclose()
+
+    async def __aenter__(self) -> Self:
+        """Use the service for a block of requests, such as a batch run.
+
+        Returns:
+            This service.
+        """
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close the HTTP connection pool when the block exits.
+
+        Args:
+            *exc_info: Exception raised in the block, if any.
+        """
+        await self.close()
+
+    def _build_messages(self, context: dict[str, Any]) -> list[dict[str, str]]:
+        """Render the system and user prompts into chat messages.
+
+        Args:
+            context: Dictionary containing template context data.
+
+        Returns:
+            The system and user messages for the chat completion.
+        """
+        # Add custom instruction to context if it exists
+        context["custom_instruction"] = self.custom_instruction
+
+        # Render the user prompt
+        prompt = self.template_engine.render_template("discharge_prompt.j2", context)
+
+        return [self._system_message, {"role": "user", "content": prompt}]
+
+    def _cache_key(self, messages: list[dict[str, str]]) -> str:
+        """Build the response cache key for a request.
+
+        The key covers every completion setting as well as the prompts, so
+        notes generated with other settings are never returned.
+
+        Args:
+            messages: The chat messages of the request.
+
+        Returns:
+            Cache key for the request.
+        """
+        return make_cache_key(
+            *(f"{name}={value}" for name, value in self._completion_kwargs.items()),
+            *(message["content"] for message in messages),
+        )
 
-    def generate_discharge_note(self, context: dict[str, Any]) -> str:
+    def build_request_body(self, context: dict[str, Any]) -> dict[str, Any]:
+        """Build the chat completion request for a discharge note.
+
+        Used for requests that are not sent by this service itself, such as
+        those submitted through the Batch API.
+
+        Args:
+            context: Dictionary containing template context data.
+
+        Returns:
+            Request body for the chat completions endpoint.
+        """
+        return {"messages": self._build_messages(context), **self._completion_kwargs}
+
+    async def generate_discharge_note(self, context: dict[str, Any]) -> str:
         """Generate a discharge note based on consultation data.
 
         Args:
@@ -49,36 +178,72 @@ class LLMService:
             Exception: If there's an error generating the note.
         """
         try:
-            # Add custom instruction to context if it exists
-            context["custom_instruction"] = config_manager.get("custom_instruction", "")
+            messages = self._build_messages(context)
 
-            # Render templates
-            system_message = self.template_engine.render_template(
-                "system_message.j2", context
-            )
-            prompt = self.template_engine.render_template(
-                "discharge_prompt.j2", context
+            # Return a cached note for identical prompts and settings
+            cache_key = self._cache_key(messages)
+            cached_note = await self.cache.get(cache_key)
+            if cached_note is not None:
+                return cached_note
+
+            # Call the OpenAI API
+            response = await self.client.chat.completions.create(
+                messages=messages, **self._completion_kwargs
             )
 
+            # Extract, cache and return the generated note
+            discharge_note = response.choices[0].message.content.strip()
+            await self.cache.set(cache_key, discharge_note)
+            return discharge_note
+        except Exception as e:
+            raise Exception(f"Error generating discharge note: {e}")
+
+    async def stream_discharge_note(
+        self, context: dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Stream a discharge note as the language model generates it.
+
+        A cached note for the same prompts and settings is yielded in one piece.
+
+        Args:
+            context: Dictionary containing template context data.
+
+        Yields:
+            Fragments of the generated discharge note.
+
+        Raises:
+            Exception: If there's an error generating the note.
+        """
+        try:
+            messages = self._build_messages(context)
+
+            # Return a cached note for identical prompts and settings
+            cache_key = self._cache_key(messages)
+            cached_note = await self.cache.get(cache_key)
+            if cached_note is not None:
+                yield cached_note
+                return
+
             # Call the OpenAI API
-            response = self.client.chat.completions.create(
-                model=config_manager.get("model"),
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=config_manager.get("temperature"),
-                max_tokens=config_manager.get("max_tokens"),
+            stream = await self.client.chat.completions.create(
+                messages=messages, stream=True, **self._completion_kwargs
             )
 
-            # Extract and return the generated note
-            return response.choices[0].message.content.strip()
+            # Yield fragments as they arrive, then cache the full note
+            fragments = []
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    fragments.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+            await self.cache.set(cache_key, "".join(fragments).strip())
         except Exception as e:
             raise Exception(f"Error generating discharge note: {e}")
 
 
 # Factory function to create LLMService instances
-def create_llm_service(template_engine: TemplateEngine | None = None) -> LLMService:
+def create_llm_service(
+    template_engine: TemplateRenderer | None = None,
+) -> LLMService:
     """Create a new LLMService instance.
 
     Args:
@@ -0,0 +1,145 @@
+"""Response cache for generated discharge notes.
+
+This module provides a two-tier cache for discharge notes keyed by a hash of
+the rendered prompts, so that identical requests skip the language model call.
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+
+from provet.utils.config import config_manager
+
+try:
+    from blake3 import blake3
+except ImportError:  # pragma: no cover - blake3 is an optional dependency
+    blake3 = None
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - redis is an optional dependency
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(*parts: str) -> str:
+    """Build a cache key from the parts of a request.
+
+    Args:
+        parts: Strings that together identify a request, e.g. the model name
+            and the rendered prompts.
+
+    Returns:
+        Hex digest identifying the request. BLAKE3 is used when installed,
+        otherwise BLAKE2b; both produce 128-bit digests.
+    """
+    digest = blake3() if blake3 is not None else hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    if blake3 is not None:
+        return digest.hexdigest(length=16)
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """Two-tier cache for generated discharge notes.
+
+    Notes are kept in a bounded in-process LRU and, when a Redis URL is
+    configured, in Redis with an expiry so they are shared across workers.
+    Redis failures are logged and treated as cache misses.
+
+    Attributes:
+        max_size: Maximum number of notes kept in the in-process tier.
+        ttl: Expiry in seconds for notes stored in Redis.
+        redis: Async Redis client, or None if Redis is not configured.
+    """
+
+    def __init__(
+        self, max_size: int = 1024, ttl: int = 3600, redis_url: str | None = None
+    ) -> None:
+        """Initialize the response cache.
+
+        Args:
+            max_size: Maximum number of notes kept in the in-process tier.
+            ttl: Expiry in seconds for notes stored in Redis.
+            redis_url: Redis connection URL. If not provided, only the
+                in-process tier is used.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._local: OrderedDict[str, str] = OrderedDict()
+        self.redis = None
+
+        if redis_url:
+            if redis_asyncio is None:
+                logger.warning("⚠️ REDIS_URL is set but redis is not installed")
+            else:
+                self.redis = redis_asyncio.Redis.from_url(
+                    redis_url, decode_responses=True
+                )
+
+    async def get(self, key: str) -> str | None:
+        """Look up a cached discharge note.
+
+        Args:
+            key: Cache key built with make_cache_key.
+
+        Returns:
+            The cached discharge note, or None on a cache miss.
+        """
+        note = self._local.get(key)
+        if note is not None:
+            self._local.move_to_end(key)
+            return note
+
+        if self.redis is not None:
+            try:
+                note = await self.redis.get(key)
+            except Exception as e:
+                logger.warning(f"⚠️ Error reading from Redis cache: {e}")
+                return None
+            if note is not None:
+                self._remember(key, note)
+
+        return note
+
+    async def set(self, key: str, note: str) -> None:
+        """Store a discharge note in the cache.
+
+        Args:
+            key: Cache key built with make_cache_key.
+            note: The discharge note to cache.
+        """
+        self._remember(key, note)
+
+        if self.redis is not None:
+            try:
+                await self.redis.setex(key, self.ttl, note)
+            except Exception as e:
+                logger.warning(f"⚠️ Error writing to Redis cache: {e}")
+
+    def clear(self) -> None:
+        """Clear the in-process tier of the cache."""
+        self._local.clear()
+
+    def _remember(self, key: str, note: str) -> None:
+        """Store a note in the in-process tier, evicting the oldest if full.
+
+        Args:
+            key: Cache key built with make_cache_key.
+            note: The discharge note to cache.
+        """
+        self._local[key] = note
+        self._local.move_to_end(key)
+        if len(self._local) > self.max_size:
+            self._local.popitem(last=False)
+
+
+# Create a singleton instance shared by all LLM services in the process
+response_cache = ResponseCache(
+    max_size=config_manager.get("cache_max_size"),
+    ttl=config_manager.get("cache_ttl"),
+    redis_url=config_manager.get("redis_url"),
+)
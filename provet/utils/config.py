@@ -5,11 +5,17 @@ from environment variables and other sources.
 """
 
 import os
+from collections.abc import Mapping
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 from dotenv import load_dotenv
 
+# Default paths, built once and shared by every configuration
+DEFAULT_TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+DEFAULT_SOLUTION_DIR = Path("solution")
+
 
 class ConfigurationManager:
     """Manages application configuration settings.
@@ -18,27 +24,43 @@ class ConfigurationManager:
     and providing access to those settings throughout the application.
 
     Attributes:
-        config (Dict[str, Any]): Dictionary containing configuration settings.
+        config (Mapping[str, Any]): Mapping containing configuration settings.
+            Read-only once the configuration has been frozen.
     """
 
     def __init__(self) -> None:
         """Initialize the configuration manager and load settings."""
-        # Load environment variables from .env file
-        load_dotenv()
+        # Load environment variables from .env file without overriding the
+        # ones already set; PROVET_SKIP_DOTENV skips the search for the file
+        if not os.getenv("PROVET_SKIP_DOTENV"):
+            load_dotenv(override=False)
 
         # Initialize config dictionary
-        self.config: dict[str, Any] = {
+        self.config: Mapping[str, Any] = {
             # API configuration
             "api_key": os.getenv("OPENAI_API_KEY"),
             # LLM configuration
             "model": os.getenv("OPENAI_MODEL", "gpt-4o"),
             "temperature": float(os.getenv("TEMPERATURE", "0.7")),
             "max_tokens": int(os.getenv("MAX_TOKENS", "800")),
+            "max_retries": int(os.getenv("OPENAI_MAX_RETRIES", "2")),
             # Custom instructions
             "custom_instruction": os.getenv("CUSTOM_SYSTEM_INSTRUCTION", ""),
+            # Concurrent OpenAI requests when processing several files
+            "max_concurrency": int(os.getenv("OPENAI_MAX_CONCURRENCY", "20")),
+            # Response cache configuration
+            "redis_url": os.getenv("REDIS_URL"),
+            "cache_ttl": int(os.getenv("CACHE_TTL", "3600")),
+            "cache_max_size": int(os.getenv("CACHE_MAX_SIZE", "1024")),
+            # Reload templates when they change on disk
+            "debug": os.getenv("DEBUG", "false").lower() == "true",
+            # Template engine: "jinja2" or "minijinja"
+            "template_backend": os.getenv("TEMPLATE_BACKEND", "jinja2"),
+            # Compiled template cache; Jinja2's per-user temp dir if unset
+            "jinja_cache_dir": os.getenv("JINJA_CACHE_DIR"),
             # Default paths
-            "templates_dir": Path(__file__).parent.parent / "templates",
-            "solution_dir": Path("solution"),
+            "templates_dir": DEFAULT_TEMPLATES_DIR,
+            "solution_dir": DEFAULT_SOLUTION_DIR,
         }
 
         # Validate necessary configuration
@@ -74,7 +96,11 @@ class ConfigurationManager:
         Args:
             key: The configuration key to set.
             value: The value to assign to the key.
+
+        Raises:
+            RuntimeError: If the configuration has been frozen.
         """
+        self._check_not_frozen()
         self.config[key] = value
 
     def update(self, new_config: dict[str, Any]) -> None:
@@ -82,9 +108,36 @@ class ConfigurationManager:
 
         Args:
             new_config: Dictionary containing configuration values to update.
+
+        Raises:
+            RuntimeError: If the configuration has been frozen.
         """
+        self._check_not_frozen()
         self.config.update(new_config)
 
+    def freeze(self) -> None:
+        """Make the configuration read-only.
+
+        Services copy configuration values when they are created, so changes
+        made afterwards would not reach them. Freezing turns such changes into
+        errors instead of silent drift.
+        """
+        self.config = MappingProxyType(dict(self.config))
+
+    @property
+    def frozen(self) -> bool:
+        """Whether the configuration has been frozen."""
+        return isinstance(self.config, MappingProxyType)
+
+    def _check_not_frozen(self) -> None:
+        """Raise an error if the configuration has been frozen.
+
+        Raises:
+            RuntimeError: If the configuration has been frozen.
+        """
+        if self.frozen:
+            raise RuntimeError("Configuration is frozen and cannot be changed.")
+
 
 # Create a singleton instance for global access
 config_manager = ConfigurationManager()
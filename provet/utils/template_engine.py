@@ -4,32 +4,74 @@ This module provides functionality for working with Jinja2 templates, including
 rendering templates with context data.
 """
 
+import threading
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
-from jinja2 import Environment, FileSystemLoader, Template
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
 
 from provet.utils.config import config_manager
 
+try:
+    import minijinja
+except ImportError:  # pragma: no cover - minijinja is an optional dependency
+    minijinja = None
+
+# Extensions of the templates compiled when the engine starts
+TEMPLATE_EXTENSIONS = ("j2",)
+
+
+def _create_bytecode_cache() -> FileSystemBytecodeCache:
+    """Create the on-disk cache for compiled templates.
+
+    Uses the directory configured as ``jinja_cache_dir``, created readable by
+    the current user only, or Jinja2's own per-user temp directory.
+
+    Returns:
+        Bytecode cache for the Jinja2 environment.
+    """
+    cache_dir = config_manager.get("jinja_cache_dir")
+    if not cache_dir:
+        return FileSystemBytecodeCache()
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+    return FileSystemBytecodeCache(str(cache_dir))
+
 
 class TemplateEngine:
     """Template rendering engine using Jinja2.
 
     This class handles loading and rendering of Jinja2 templates with
-    provided context data.
+    provided context data. Compiled templates are cached on disk across
+    processes, and all templates are compiled and loaded at startup. Outside
+    debug mode, templates are never reloaded from disk.
 
     Attributes:
         env (Environment): Jinja2 environment for template processing.
+        debug (bool): Whether templates are reloaded when they change.
     """
 
     def __init__(self) -> None:
         """Initialize the template engine using the default templates directory from config."""
         self.templates_dir = config_manager.get("templates_dir")
-        self.env = Environment(loader=FileSystemLoader(self.templates_dir))
+        self.debug = bool(config_manager.get("debug"))
+        self.env = Environment(
+            loader=FileSystemLoader(self.templates_dir),
+            bytecode_cache=_create_bytecode_cache(),
+            auto_reload=self.debug,
+            cache_size=-1,
+        )
+        self._templates: dict[str, Template] = {
+            name: self.env.get_template(name)
+            for name in self.env.list_templates(extensions=TEMPLATE_EXTENSIONS)
+        }
 
     def get_template(self, template_name: str) -> Template:
         """Get a Jinja2 template by name.
 
+        Templates are remembered after they are first loaded and returned
+        without going through the Jinja2 environment, unless in debug mode.
+
         Args:
             template_name: Name of the template file.
 
@@ -39,7 +81,14 @@ class TemplateEngine:
         Raises:
             TemplateNotFound: If the template doesn't exist.
         """
-        return self.env.get_template(template_name)
+        if self.debug:
+            return self.env.get_template(template_name)
+
+        template = self._templates.get(template_name)
+        if template is None:
+            template = self.env.get_template(template_name)
+            self._templates[template_name] = template
+        return template
 
     def render_template(self, template_name: str, context: dict[str, Any]) -> str:
         """Render a template with the provided context.
@@ -56,4 +105,132 @@ class TemplateEngine:
             TemplateError: If there's an error during rendering.
         """
         template = self.get_template(template_name)
-        return template.render(**context)
+        return template.render(context)
+
+    def render_template_to_stream(
+        self, template_name: str, context: dict[str, Any], sink: IO[str]
+    ) -> None:
+        """Render a template into a text stream as it is evaluated.
+
+        The output is written in pieces, so it is never held in memory as
+        one string.
+
+        Args:
+            template_name: Name of the template file.
+            context: Dictionary containing context data for template rendering.
+            sink: Text stream the rendered output is written to.
+
+        Raises:
+            TemplateNotFound: If the template doesn't exist.
+            TemplateError: If there's an error during rendering.
+        """
+        template = self.get_template(template_name)
+        sink.writelines(template.generate(context))
+
+
+class MiniJinjaTemplateEngine:
+    """Template rendering engine using MiniJinja.
+
+    A drop-in alternative to TemplateEngine for rendering, backed by the
+    Rust MiniJinja engine. Templates are compiled once and kept in memory by
+    the MiniJinja environment.
+
+    Attributes:
+        env (minijinja.Environment): MiniJinja environment for template
+            processing.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the template engine using the default templates directory from config.
+
+        Raises:
+            ImportError: If minijinja is not installed.
+        """
+        if minijinja is None:
+            raise ImportError(
+                "The minijinja template backend requires the minijinja package. "
+                "Install it with the 'minijinja' extra."
+            )
+        self.templates_dir = config_manager.get("templates_dir")
+        self.env = minijinja.Environment(
+            loader=minijinja.load_from_path(str(self.templates_dir))
+        )
+
+    def render_template(self, template_name: str, context: dict[str, Any]) -> str:
+        """Render a template with the provided context.
+
+        Args:
+            template_name: Name of the template file.
+            context: Dictionary containing context data for template rendering.
+
+        Returns:
+            The rendered template as a string.
+
+        Raises:
+            TemplateError: If the template doesn't exist or fails to render.
+        """
+        return self.env.render_template(template_name, **context)
+
+    def render_template_to_stream(
+        self, template_name: str, context: dict[str, Any], sink: IO[str]
+    ) -> None:
+        """Render a template into a text stream.
+
+        MiniJinja renders whole templates, so the output is written at once.
+
+        Args:
+            template_name: Name of the template file.
+            context: Dictionary containing context data for template rendering.
+            sink: Text stream the rendered output is written to.
+
+        Raises:
+            TemplateError: If the template doesn't exist or fails to render.
+        """
+        sink.write(self.render_template(template_name, context))
+
+
+# Either template engine can render the prompts
+TemplateRenderer = TemplateEngine | MiniJinjaTemplateEngine
+
+
+# Factory function to create template engines
+def create_template_engine() -> TemplateRenderer:
+    """Create a template engine for the configured backend.
+
+    The backend is chosen by the ``template_backend`` setting: "jinja2"
+    (default) or "minijinja".
+
+    Returns:
+        New template engine instance.
+
+    Raises:
+        ValueError: If the configured backend is unknown.
+    """
+    backend = config_manager.get("template_backend", "jinja2")
+    if backend == "jinja2":
+        return TemplateEngine()
+    if backend == "minijinja":
+        return MiniJinjaTemplateEngine()
+    raise ValueError(f"Unknown template backend: {backend}")
+
+
+# Process-wide template engine, created on first use
+_engine: TemplateRenderer | None = None
+_engine_lock = threading.Lock()
+
+
+def get_template_engine() -> TemplateRenderer:
+    """Get the process-wide template engine, creating it on first use.
+
+    Sharing one engine avoids rebuilding the environment and recompiling
+    templates for every generator or service.
+
+    Returns:
+        The shared template engine.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_template_engine()
+    return _engine
@@ -44,7 +44,7 @@ if [ ! -f .env ]; then
 fi
 
 # Create directories if they don't exist
-mkdir -p solution temp_uploads
+mkdir -p solution
 
 # Make CLI script executable
 chmod +x provet_cli.py
@@ -54,7 +54,8 @@ echo "🟢 CLI virtual environment is now activated"
 echo ""
 echo "📚 To use the CLI:"
 echo "1️⃣ Activate the virtual environment: source $ENV_DIR/bin/activate"
-echo "2️⃣ Run the CLI: ./provet_cli.py [input_file.json]"
+echo "2️⃣ Run the CLI: provet [input_file.json]"
+echo "   or: ./provet_cli.py [input_file.json]"
 echo "   or: python -m provet [input_file.json]"
 echo ""
 echo "⏹️ To deactivate the virtual environment: deactivate" 
\ No newline at end of file
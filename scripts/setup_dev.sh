@@ -44,7 +44,7 @@ uv sync --all-groups
 uv lock --upgrade
 
 # Create directories if they don't exist
-mkdir -p solution temp_uploads
+mkdir -p solution
 
 echo "✅ ==== Development Environment Setup Complete ==== ✅"
 echo "🟢 Virtual environment: $ENV_DIR is now activated"
@@ -20,7 +20,7 @@ if ! command -v docker-compose &> /dev/null; then
 fi
 
 # Create directories if they don't exist
-mkdir -p solution temp_uploads
+mkdir -p solution
 
 # Create .env file if it doesn't exist
 if [ ! -f .env ]; then
@@ -3,94 +3,150 @@
 This module provides fixtures that can be shared across all test modules.
 """
 
-import json
+import copy
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Any
-from unittest.mock import MagicMock
+from types import MappingProxyType, SimpleNamespace
+from typing import TYPE_CHECKING, Any
+from unittest.mock import MagicMock, Mock, patch
 
+import orjson
 import pytest
 
 from provet.core.data_models import ConsultationData
+from provet.core.response_cache import response_cache
+from provet.utils.config import config_manager
 from provet.utils.template_engine import TemplateEngine
 
+if TYPE_CHECKING:
+    from provet.core.app import DischargeNoteGenerator
 
-@pytest.fixture
-def sample_consultation_data() -> dict[str, Any]:
-    """Create a sample dictionary of consultation data for testing.
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Clear the process-wide response cache so tests don't share notes.
+
+    Yields:
+        None, clearing the cache again after the test.
+    """
+    response_cache.clear()
+    yield
+    response_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def restore_config():
+    """Undo freezing of the process-wide configuration after each test.
+
+    Yields:
+        None, restoring the configuration after the test.
+    """
+    config = config_manager.config
+    yield
+    config_manager.config = config
+
+
+def _freeze(value: Any) -> Any:
+    """Make nested test data read-only so it can be shared between tests.
+
+    Args:
+        value: Data built from dicts, lists and scalars.
 
     Returns:
-        Dictionary containing sample consultation data.
+        The same data with dicts as mapping proxies and lists as tuples.
     """
-    return {
-        "patient": {
-            "name": "Max",
-            "species": "Dog (Canine - Domestic)",
-            "breed": "Golden Retriever",
-            "gender": "Male",
-            "neutered": True,
-            "date_of_birth": "2018-05-10",
-            "weight": "32 kg",
-            "microchip": "123456789012345",
-        },
-        "consultation": {
-            "date": "2023-07-15",
-            "time": "10:30",
-            "reason": "Vomiting and lethargy",
-            "type": "Outpatient",
-            "clinical_notes": [
-                {
-                    "note": "Patient presented with vomiting and lethargy for the past 24 hours.",
-                    "type": "general",
-                },
-                {
-                    "note": "Suspected gastroenteritis based on symptoms and examination.",
-                    "type": "assessment",
-                },
-            ],
-            "treatment_items": {
-                "procedures": [
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@pytest.fixture(scope="session")
+def sample_consultation_data() -> Mapping[str, Any]:
+    """Create a sample mapping of consultation data for testing.
+
+    The data is built once per test session and frozen, so tests can't
+    modify it for each other.
+
+    Returns:
+        Read-only mapping containing sample consultation data.
+    """
+    return _freeze(
+        {
+            "patient": {
+                "name": "Max",
+                "species": "Dog (Canine - Domestic)",
+                "breed": "Golden Retriever",
+                "gender": "Male",
+                "neutered": True,
+                "date_of_birth": "2018-05-10",
+                "weight": "32 kg",
+                "microchip": "123456789012345",
+            },
+            "consultation": {
+                "date": "2023-07-15",
+                "time": "10:30",
+                "reason": "Vomiting and lethargy",
+                "type": "Outpatient",
+                "clinical_notes": [
                     {
-                        "name": "Physical examination",
-                        "date": "2023-07-15",
-                        "time": "10:35",
+                        "note": "Patient presented with vomiting and lethargy for the past 24 hours.",
+                        "type": "general",
                     },
-                    {"name": "Blood test", "date": "2023-07-15", "time": "10:45"},
-                ],
-                "medicines": [
                     {
-                        "name": "Cerenia",
-                        "dosage": "2 mg/kg",
-                        "instructions": "Administered subcutaneously",
-                    }
+                        "note": "Suspected gastroenteritis based on symptoms and examination.",
+                        "type": "assessment",
+                    },
                 ],
-                "prescriptions": [
+                "treatment_items": {
+                    "procedures": [
+                        {
+                            "name": "Physical examination",
+                            "date": "2023-07-15",
+                            "time": "10:35",
+                        },
+                        {"name": "Blood test", "date": "2023-07-15", "time": "10:45"},
+                    ],
+                    "medicines": [
+                        {
+                            "name": "Cerenia",
+                            "dosage": "2 mg/kg",
+                            "instructions": "Administered subcutaneously",
+                        }
+                    ],
+                    "prescriptions": [
+                        {
+                            "name": "Metronidazole",
+                            "dosage": "10 mg/kg twice daily",
+                            "instructions": "Give with food",
+                            "duration": "5 days",
+                        }
+                    ],
+                    "foods": [],
+                    "supplies": [],
+                },
+                "diagnostics": [
                     {
-                        "name": "Metronidazole",
-                        "dosage": "10 mg/kg twice daily",
-                        "instructions": "Give with food",
-                        "duration": "5 days",
+                        "name": "Complete Blood Count",
+                        "result": "Within normal limits",
+                        "notes": "No significant abnormalities detected",
                     }
                 ],
-                "foods": [],
-                "supplies": [],
             },
-            "diagnostics": [
-                {
-                    "name": "Complete Blood Count",
-                    "result": "Within normal limits",
-                    "notes": "No significant abnormalities detected",
-                }
-            ],
-        },
-    }
+        }
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def consultation_data_object(sample_consultation_data) -> ConsultationData:
     """Create a ConsultationData object for testing.
 
+    The models are frozen, so one object is parsed per test session and
+    shared by all tests.
+
     Args:
-        sample_consultation_data: Dictionary fixture with sample data.
+        sample_consultation_data: Mapping fixture with sample data.
 
     Returns:
         ConsultationData object populated with sample data.
@@ -98,50 +154,123 @@ def consultation_data_object(sample_consultation_data) -> ConsultationData:
     return ConsultationData.from_dict(sample_consultation_data)
 
 
+@pytest.fixture(scope="session")
+def _template_engine_mock() -> MagicMock:
+    """Create the mock template engine shared by the test session.
+
+    Returns:
+        MagicMock object mocking TemplateEngine.
+    """
+    return MagicMock(spec=TemplateEngine)
+
+
 @pytest.fixture
-def mock_template_engine() -> MagicMock:
+def mock_template_engine(_template_engine_mock) -> MagicMock:
     """Create a mock template engine.
 
+    The session's mock is reset instead of building a new spec'd mock for
+    every test.
+
+    Args:
+        _template_engine_mock: Mock template engine shared by the session.
+
     Returns:
         MagicMock object mocking TemplateEngine.
     """
-    mock = MagicMock(spec=TemplateEngine)
+    mock = _template_engine_mock
+    mock.reset_mock(return_value=True, side_effect=True)
     mock.render_template.return_value = "Test template rendering"
     return mock
 
 
-@pytest.fixture
-def mock_openai_response() -> MagicMock:
-    """Create a mock OpenAI API response.
+@pytest.fixture(scope="module")
+def base_generator() -> "DischargeNoteGenerator":
+    """Create a DischargeNoteGenerator once per test module.
+
+    The LLM service is mocked so no OpenAI client is built. The generator
+    is imported here so that test modules which don't use it never import
+    OpenAI and httpx.
 
     Returns:
-        MagicMock object simulating an OpenAI API response.
+        DischargeNoteGenerator shared by the module's tests.
     """
-    mock_message = MagicMock()
-    mock_message.content = "This is a test discharge note."
+    from provet.core.app import DischargeNoteGenerator
 
-    mock_choice = MagicMock()
-    mock_choice.message = mock_message
+    with patch("provet.core.app.create_llm_service"):
+        return DischargeNoteGenerator()
 
-    mock_response = MagicMock()
-    mock_response.choices = [mock_choice]
 
-    return mock_response
+@pytest.fixture(scope="module")
+def generator_mocks() -> tuple[Mock, Mock]:
+    """Create mock collaborators for the generator once per test module.
+
+    Plain specced Mocks are used since the tests don't need MagicMock's
+    magic methods.
+
+    Returns:
+        Tuple of a mock IO manager and a mock LLM service.
+    """
+    from provet.core.io_manager import IOManager
+    from provet.core.llm_service import LLMService
+
+    return Mock(spec=IOManager), Mock(spec=LLMService)
 
 
 @pytest.fixture
-def temp_file(tmp_path) -> Path:
+def generator(base_generator, generator_mocks) -> "DischargeNoteGenerator":
+    """Create a DischargeNoteGenerator with freshly reset mock collaborators.
+
+    Copies the module's shared generator instead of constructing a new one,
+    and resets the module's mocks rather than building new ones.
+
+    Args:
+        base_generator: Generator shared by the module's tests.
+        generator_mocks: Mock IO manager and LLM service shared by the
+            module's tests.
+
+    Returns:
+        DischargeNoteGenerator with a mock IO manager and LLM service.
+    """
+    io_manager, llm_service = generator_mocks
+    for mock in generator_mocks:
+        mock.reset_mock(return_value=True, side_effect=True)
+
+    generator = copy.copy(base_generator)
+    generator.io_manager = io_manager
+    generator.llm_service = llm_service
+    return generator
+
+
+@pytest.fixture(scope="session")
+def mock_openai_response() -> SimpleNamespace:
+    """Create a fake OpenAI API response.
+
+    A plain namespace is much cheaper to build than nested MagicMocks and
+    can be shared, since tests only read it.
+
+    Returns:
+        SimpleNamespace shaped like an OpenAI chat completion response.
+    """
+    message = SimpleNamespace(content="This is a test discharge note.")
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture(scope="session")
+def temp_file(tmp_path_factory) -> Path:
     """Create a temporary file with sample consultation data.
 
+    The file is written once per test session and shared, so tests must not
+    modify it; copy it first if a test needs to.
+
     Args:
-        tmp_path: Pytest fixture providing a temporary directory.
+        tmp_path_factory: Pytest fixture for creating temporary directories.
 
     Returns:
         Path to the temporary file.
     """
-    file_path = tmp_path / "test_consultation.json"
-    with open(file_path, "w") as f:
-        json.dump(
+    file_path = tmp_path_factory.mktemp("consultation") / "test_consultation.json"
+    file_path.write_bytes(
+        orjson.dumps(
             {
                 "patient": {
                     "name": "Max",
@@ -159,7 +288,7 @@ def temp_file(tmp_path) -> Path:
                     "type": "Outpatient",
                     "clinical_notes": [],
                 },
-            },
-            f,
+            }
         )
+    )
     return file_path
@@ -3,20 +3,36 @@
 Tests for the API endpoints in main.py.
 """
 
+import asyncio
+import io
 from pathlib import Path
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import MagicMock, patch
 
+import orjson
 import pytest
-from fastapi import HTTPException
+from fastapi import HTTPException, UploadFile
 from fastapi.testclient import TestClient
 
-from api.main import app
+from api.main import (
+    app,
+    get_batch_semaphore,
+    get_discharge_generator,
+    read_upload,
+    root,
+    upload_consultation_file,
+)
+from provet.core.app import DischargeNoteGenerator
+from provet.core.data_models import ConsultationData
+from provet.utils.config import config_manager
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_client():
     """Create a test client for the FastAPI application.
 
+    The client is shared by the module's HTTP tests; endpoint logic is tested
+    by awaiting the endpoint coroutines directly instead.
+
     Returns:
         TestClient instance for making requests to the app.
     """
@@ -35,33 +51,37 @@ def mock_discharge_generator():
     return mock
 
 
+@pytest.fixture
+def mock_generator():
+    """Replace the application's discharge note generator with a mock.
+
+    Yields:
+        MagicMock object simulating a DischargeNoteGenerator.
+    """
+    mock = MagicMock(spec=DischargeNoteGenerator)
+    app.dependency_overrides[get_discharge_generator] = lambda: mock
+    app.dependency_overrides[get_batch_semaphore] = lambda: asyncio.Semaphore(20)
+    yield mock
+    app.dependency_overrides.clear()
+
+
 class TestAPIEndpoints:
     """Test class for API endpoints."""
 
-    def test_root_endpoint(self, test_client):
+    def test_root_endpoint(self):
         """Test the root endpoint.
 
         Given: The API server
-        When: A GET request is made to "/"
-        Then: It should return a 200 status code and a status of "ok".
+        When: The "/" endpoint is called
+        Then: It should return a status of "ok".
         """
         # Execute
-        response = test_client.get("/")
+        result = asyncio.run(root())
 
         # Assert
-        assert response.status_code == 200
-        assert response.json() == {"status": "✅ API is up and running"}
-
-    @patch("api.main.discharge_generator")
-    @patch("api.main.Path")
-    @patch(
-        "builtins.open",
-        new_callable=mock_open,
-        read_data='{"discharge_note": "Test discharge note"}',
-    )
-    def test_generate_endpoint_success(
-        self, mock_file, mock_path, mock_generator, test_client
-    ):
+        assert result == {"status": "✅ API is up and running"}
+
+    def test_generate_endpoint_success(self, mock_generator, test_client):
         """Test the generate endpoint with valid data.
 
         Given: Valid consultation data and a mock generator
@@ -69,9 +89,7 @@ class TestAPIEndpoints:
         Then: It should return a 200 status code and the generated discharge note.
         """
         # Setup
-        mock_generator.process_file.return_value = "test_output.json"
-        mock_path.return_value.exists.return_value = True
-        mock_path.return_value.open.return_value = mock_file.return_value
+        mock_generator.process_dict.return_value = "Test discharge note"
 
         # Execute
         response = test_client.post(
@@ -100,53 +118,267 @@ class TestAPIEndpoints:
         # Assert
         assert response.status_code == 200
         assert response.json() == {"discharge_note": "Test discharge note"}
+        mock_generator.process_dict.assert_awaited_once()
+        mock_generator.process_file.assert_not_called()
+        consultation_data = mock_generator.process_dict.call_args[0][0]
+        assert isinstance(consultation_data, ConsultationData)
+        assert consultation_data.patient.name == "Max"
+
+    def test_generate_endpoint_invalid_data(self, mock_generator, test_client):
+        """Test the generate endpoint with malformed consultation data.
+
+        Given: Consultation data with a value of the wrong type
+        When: A POST request is made to "/generate"
+        Then: It should return a 422 status code without calling the generator.
+        """
+        # Execute
+        response = test_client.post(
+            "/generate",
+            json={"consultation_data": {"patient": {"neutered": "sometimes"}}},
+        )
+
+        # Assert
+        assert response.status_code == 422
+        mock_generator.process_dict.assert_not_called()
 
-    @patch("api.main.discharge_generator")
-    @patch("api.main.UPLOAD_DIR")
     @patch("api.main.logger")
-    def test_generate_endpoint_error(
-        self, mock_logger, mock_upload_dir, mock_generator, test_client
-    ):
+    def test_generate_endpoint_error(self, mock_logger, mock_generator, test_client):
         """Test the generate endpoint with a processing error.
 
         Given: Valid consultation data but a generator that raises an exception
         When: A POST request is made to "/generate"
         Then: It should return a 500 status code with an error message.
         """
-        # Setup - Create a more predictable exception
-        mock_generator.process_file.side_effect = ValueError("Test error")
-        mock_upload_dir.__truediv__.return_value = Path("test_file.json")
-        
-        # Mock Path.exists and Path.unlink to avoid UnboundLocalError for output_path
-        with patch("pathlib.Path.exists", return_value=False):  # Avoid trying to unlink files
-            # Execute
-            response = test_client.post(
-                "/generate",
-                json={
-                    "consultation_data": {
-                        "patient": {
-                            "name": "Max",
-                            "species": "Dog",
-                            "breed": "Golden Retriever",
-                            "gender": "Male",
-                            "neutered": True,
-                            "date_of_birth": "2018-05-10",
-                            "weight": "32 kg",
-                        },
-                        "consultation": {
-                            "date": "2023-07-15",
-                            "time": "10:30",
-                            "reason": "Vomiting",
-                            "type": "Outpatient",
-                        },
-                    }
-                },
-            )
+        # Setup
+        mock_generator.process_dict.side_effect = ValueError("Test error")
+
+        # Execute
+        response = test_client.post(
+            "/generate",
+            json={
+                "consultation_data": {
+                    "patient": {
+                        "name": "Max",
+                        "species": "Dog",
+                        "breed": "Golden Retriever",
+                        "gender": "Male",
+                        "neutered": True,
+                        "date_of_birth": "2018-05-10",
+                        "weight": "32 kg",
+                    },
+                    "consultation": {
+                        "date": "2023-07-15",
+                        "time": "10:30",
+                        "reason": "Vomiting",
+                        "type": "Outpatient",
+                    },
+                }
+            },
+        )
 
         # Assert
         assert response.status_code == 500
         mock_logger.error.assert_called_once()
 
+    @patch("api.main.logger")
+    def test_batch_endpoint(self, mock_logger, mock_generator, test_client):
+        """Test the batch endpoint with one failing consultation.
+
+        Given: Three consultations, the second of which fails to generate
+        When: A POST request is made to "/batch"
+        Then: It should return notes and errors per consultation, in order.
+        """
+
+        # Setup
+        async def process_dict(consultation_data):
+            if consultation_data.patient.name == "Luna":
+                raise ValueError("Test error")
+            return f"Note for {consultation_data.patient.name}"
+
+        mock_generator.process_dict.side_effect = process_dict
+
+        # Execute
+        response = test_client.post(
+            "/batch",
+            json=[
+                {"consultation_data": {"patient": {"name": name}}}
+                for name in ("Max", "Luna", "Buddy")
+            ],
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == [
+            {"discharge_note": "Note for Max", "error": None},
+            {"discharge_note": None, "error": "Test error"},
+            {"discharge_note": "Note for Buddy", "error": None},
+        ]
+        assert mock_generator.process_dict.await_count == 3
+        mock_logger.error.assert_called_once()
+
+    def test_batch_endpoint_concurrency_limit(self, mock_generator, test_client):
+        """Test that the batch endpoint limits concurrent generations.
+
+        Given: A concurrency limit of two and five consultations
+        When: A POST request is made to "/batch"
+        Then: No more than two notes should be generated at once.
+        """
+        # Setup
+        running = 0
+        peak = 0
+
+        async def process_dict(_consultation_data):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return "Test discharge note"
+
+        mock_generator.process_dict.side_effect = process_dict
+        semaphore = asyncio.Semaphore(2)
+        app.dependency_overrides[get_batch_semaphore] = lambda: semaphore
+
+        # Execute
+        response = test_client.post(
+            "/batch", json=[{"consultation_data": {}} for _ in range(5)]
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert len(response.json()) == 5
+        assert peak == 2
+
+    @patch("api.main.MAX_BATCH_SIZE", 2)
+    def test_batch_endpoint_too_large(self, mock_generator, test_client):
+        """Test the batch endpoint with too many consultations.
+
+        Given: More consultations than MAX_BATCH_SIZE
+        When: A POST request is made to "/batch"
+        Then: It should return a 413 status code without generating notes.
+        """
+        # Execute
+        response = test_client.post(
+            "/batch", json=[{"consultation_data": {}} for _ in range(3)]
+        )
+
+        # Assert
+        assert response.status_code == 413
+        mock_generator.process_dict.assert_not_called()
+
+    @patch("api.main.logger")
+    def test_upload_batch_endpoint(self, mock_logger, mock_generator, test_client):
+        """Test the upload batch endpoint with valid and invalid files.
+
+        Given: A valid JSON file, a text file and a malformed JSON file
+        When: A POST request is made to "/upload_batch" with the files
+        Then: It should return a note for the valid file and errors for the others.
+        """
+        # Setup
+        mock_generator.process_dict.return_value = "Test discharge note"
+        files = [
+            ("max.json", b'{"patient": {"name": "Max"}}', "application/json"),
+            ("notes.txt", b"test content", "text/plain"),
+            ("bad.json", b"{not json", "application/json"),
+        ]
+
+        # Execute
+        response = test_client.post(
+            "/upload_batch", files=[("files", file) for file in files]
+        )
+
+        # Assert
+        assert response.status_code == 200
+        results = response.json()
+        assert results[0] == {"discharge_note": "Test discharge note", "error": None}
+        assert results[1] == {
+            "discharge_note": None,
+            "error": "Only JSON files are supported",
+        }
+        assert results[2]["discharge_note"] is None
+        assert results[2]["error"]
+        mock_generator.process_dict.assert_awaited_once_with(
+            {"patient": {"name": "Max"}}
+        )
+        assert mock_logger.error.call_count == 2
+
+    def test_generate_stream_endpoint_success(self, mock_generator, test_client):
+        """Test the streaming generate endpoint.
+
+        Given: A generator that streams the note in fragments
+        When: A POST request is made to "/generate/stream"
+        Then: It should return each fragment as a server-sent event.
+        """
+
+        # Setup
+        async def fragments():
+            yield "Discharge "
+            yield "note"
+
+        mock_generator.stream_dict.return_value = fragments()
+
+        # Execute
+        response = test_client.post(
+            "/generate/stream", json={"consultation_data": {"patient": {}}}
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text == (
+            'data: {"delta":"Discharge "}\n\ndata: {"delta":"note"}\n\n'
+        )
+
+    @patch("api.main.logger")
+    def test_generate_stream_endpoint_error(
+        self, mock_logger, mock_generator, test_client
+    ):
+        """Test the streaming generate endpoint with an error mid-stream.
+
+        Given: A generator whose stream fails after the first fragment
+        When: A POST request is made to "/generate/stream"
+        Then: It should send the fragment followed by an error event.
+        """
+
+        # Setup
+        async def fragments():
+            yield "Discharge "
+            raise Exception("API error")
+
+        mock_generator.stream_dict.return_value = fragments()
+
+        # Execute
+        response = test_client.post(
+            "/generate/stream", json={"consultation_data": {"patient": {}}}
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert response.text == (
+            'data: {"delta":"Discharge "}\n\n'
+            'event: error\ndata: {"detail":"API error"}\n\n'
+        )
+        mock_logger.error.assert_called_once()
+
+    def test_generate_stream_endpoint_invalid_data(self, mock_generator, test_client):
+        """Test the streaming generate endpoint with invalid consultation data.
+
+        Given: A generator that rejects the consultation data
+        When: A POST request is made to "/generate/stream"
+        Then: It should return a 500 status code before streaming.
+        """
+        # Setup
+        mock_generator.stream_dict.side_effect = ValueError("Invalid data")
+
+        # Execute
+        response = test_client.post(
+            "/generate/stream", json={"consultation_data": {"patient": {}}}
+        )
+
+        # Assert
+        assert response.status_code == 500
+        assert response.json() == {"detail": "Invalid data"}
+
     @pytest.mark.parametrize(
         "file_content",
         [
@@ -154,46 +386,90 @@ class TestAPIEndpoints:
             '{"patient": {"name": "Luna"}, "consultation": {"reason": "Vaccination"}}',
         ],
     )
-    @patch("api.main.UPLOAD_DIR")
-    @patch("api.main.discharge_generator")
-    def test_upload_endpoint_success(
-        self, mock_generator, mock_upload_dir, file_content, test_client, tmp_path
-    ):
+    def test_upload_endpoint_success(self, mock_generator, file_content):
         """Test the upload endpoint with valid file uploads.
 
         Given: Different valid JSON file uploads and a mock generator
-        When: A POST request is made to "/upload" with the file
+        When: The "/upload" endpoint is called with the file
+        Then: It should return the generated discharge note.
+        """
+        # Setup
+        mock_generator.process_dict.return_value = "Test discharge note"
+        upload = UploadFile(
+            file=io.BytesIO(file_content.encode()), filename="test.json"
+        )
+
+        # Execute
+        result = asyncio.run(upload_consultation_file(upload, mock_generator))
+
+        # Assert
+        assert result.discharge_note == "Test discharge note"
+        mock_generator.process_dict.assert_awaited_once_with(
+            orjson.loads(file_content)
+        )
+        mock_generator.process_file.assert_not_called()
+
+    def test_upload_endpoint_http(self, mock_generator, test_client):
+        """Test the upload endpoint over HTTP.
+
+        Given: A valid JSON file and a mock generator
+        When: A multipart POST request is made to "/upload" with the file
         Then: It should return a 200 status code and the generated discharge note.
         """
-        # Skip this test for now due to dependency challenges
-        pytest.skip("Skipping due to challenges with mocking file operations")
+        # Setup
+        mock_generator.process_dict.return_value = "Test discharge note"
 
-    @patch("api.main.UPLOAD_DIR")
-    @patch("api.main.logger")
-    def test_upload_endpoint_invalid_file_type(self, mock_logger, mock_upload_dir, test_client):
+        # Execute
+        response = test_client.post(
+            "/upload",
+            files={"file": ("test.json", b'{"patient": {}}', "application/json")},
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {"discharge_note": "Test discharge note"}
+        mock_generator.process_dict.assert_awaited_once_with({"patient": {}})
+
+    def test_upload_endpoint_invalid_json(self, mock_generator, test_client):
+        """Test the upload endpoint with a file that isn't valid JSON.
+
+        Given: A .json file with malformed content
+        When: A POST request is made to "/upload" with the file
+        Then: It should return a 400 status code without calling the generator.
+        """
+        # Execute
+        response = test_client.post(
+            "/upload", files={"file": ("test.json", b"{not json", "application/json")}
+        )
+
+        # Assert
+        assert response.status_code == 400
+        assert "Invalid JSON file" in response.json()["detail"]
+        mock_generator.process_dict.assert_not_called()
+
+    def test_upload_endpoint_invalid_file_type(self, mock_generator):
         """Test the upload endpoint with an invalid file type.
 
         Given: A non-JSON file upload
-        When: A POST request is made to "/upload" with the file
-        Then: It should return a 400 status code with an error message.
+        When: The "/upload" endpoint is called with the file
+        Then: It should raise a 400 error without calling the generator.
         """
-        with patch.object(TestClient, "post") as mock_post:
-            # Create a mock response
-            mock_response = MagicMock()
-            mock_response.status_code = 400
-            mock_response.json.return_value = {"detail": "Only JSON files are supported"}
-            mock_post.return_value = mock_response
-            
-            # Use the patched client to make a request
-            response = mock_post("/upload", files={"file": ("test.txt", "test content", "text/plain")})
-            
-            # Assert
-            assert response.status_code == 400
-            assert "Only JSON files are supported" in response.json().get("detail", "")
-
-    @patch("api.main.UPLOAD_DIR")
+        # Setup
+        upload = UploadFile(file=io.BytesIO(b"test content"), filename="test.txt")
+
+        # Execute
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(upload_consultation_file(upload, mock_generator))
+
+        # Assert
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.detail == "Only JSON files are supported"
+        mock_generator.process_dict.assert_not_called()
+
     @patch("api.main.logger")
-    def test_upload_endpoint_invalid_file_type_direct(self, mock_logger, mock_upload_dir, test_client):
+    def test_upload_endpoint_invalid_file_type_direct(
+        self, mock_logger, mock_generator, test_client
+    ):
         """Test the upload endpoint with an invalid file type directly.
 
         This test directly tests the validation logic in the endpoint function.
@@ -212,115 +488,136 @@ class TestAPIEndpoints:
         
         # This test is primarily to improve code coverage of lines 151-159
 
-    @patch("api.main.UPLOAD_DIR")
-    @patch("api.main.discharge_generator")
-    def test_upload_endpoint_processing_error(
-        self, mock_generator, mock_upload_dir, test_client, tmp_path
-    ):
+    def test_upload_endpoint_processing_error(self, mock_generator):
         """Test the upload endpoint with a processing error.
 
         Given: A valid JSON file but a generator that raises an exception
-        When: A POST request is made to "/upload" with the file
-        Then: It should return a 500 status code with an error message.
+        When: The "/upload" endpoint is called with the file
+        Then: It should raise a 500 error with the error message.
         """
         # Setup
-        mock_upload_dir.mkdir.return_value = None
-        mock_upload_dir.__truediv__.return_value = tmp_path / "test.json"
-        mock_generator.process_file.side_effect = Exception("Test error")
-
-        # Create test file
-        test_content = (
-            '{"patient": {"name": "Max"}, "consultation": {"reason": "Checkup"}}'
+        mock_generator.process_dict.side_effect = Exception("Test error")
+        upload = UploadFile(
+            file=io.BytesIO(
+                b'{"patient": {"name": "Max"}, "consultation": {"reason": "Checkup"}}'
+            ),
+            filename="test.json",
         )
-        with open(tmp_path / "test.json", "w") as f:
-            f.write(test_content)
 
         # Execute
-        response = test_client.post(
-            "/upload", files={"file": ("test.json", test_content, "application/json")}
-        )
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(upload_consultation_file(upload, mock_generator))
 
         # Assert
-        assert response.status_code == 500
-        assert "error" in response.json().get("detail", "").lower()
+        assert exc_info.value.status_code == 500
+        assert exc_info.value.detail == "Test error"
 
-    def test_cleanup_files(self, tmp_path):
-        """Test the cleanup_files function.
+    @patch("api.main.UPLOAD_CHUNK_SIZE", 4)
+    def test_read_upload(self):
+        """Test reading an upload in chunks.
 
-        Given: Temporary input and output files
-        When: cleanup_files is called
-        Then: It should delete the files.
+        Given: An uploaded file larger than one chunk
+        When: read_upload is called
+        Then: It should return the whole file.
         """
         # Setup
-        input_path = tmp_path / "input.json"
-        output_path = tmp_path / "output.json"
-
-        # Create test files
-        input_path.touch()
-        output_path.touch()
-
-        from api.main import cleanup_files
+        content = b'{"patient": {"name": "Max"}}'
+        upload = UploadFile(file=io.BytesIO(content), filename="test.json")
 
         # Execute
-        cleanup_files(input_path, output_path)
+        result = asyncio.run(read_upload(upload))
 
         # Assert
-        assert not input_path.exists()
-        assert not output_path.exists()
+        assert result == content
 
-    def test_cleanup_files_nonexistent(self, tmp_path):
-        """Test the cleanup_files function with non-existent files.
+    @patch("api.main.MAX_UPLOAD_SIZE", 8)
+    def test_upload_endpoint_too_large(self, mock_generator, test_client):
+        """Test the upload endpoint with a file over the size limit.
 
-        Given: Paths to non-existent files
-        When: cleanup_files is called
-        Then: It should not raise an exception.
+        Given: A JSON file larger than MAX_UPLOAD_SIZE
+        When: A POST request is made to "/upload" with the file
+        Then: It should return a 413 status code without calling the generator.
         """
-        # Setup
-        input_path = tmp_path / "nonexistent_input.json"
-        output_path = tmp_path / "nonexistent_output.json"
+        # Execute
+        response = test_client.post(
+            "/upload",
+            files={"file": ("test.json", b'{"patient": {}}', "application/json")},
+        )
 
-        from api.main import cleanup_files
+        # Assert
+        assert response.status_code == 413
+        mock_generator.process_dict.assert_not_called()
 
-        # Execute and Assert (should not raise)
-        cleanup_files(input_path, output_path)
+    @pytest.mark.parametrize(
+        "origin,allowed",
+        [("http://localhost:3000", True), ("https://evil.example", False)],
+    )
+    def test_cors_allowlist(self, test_client, origin, allowed):
+        """Test that CORS only admits allowlisted origins.
 
-    def test_cleanup_files_error(self, tmp_path):
-        """Test error handling in the cleanup_files function.
+        Given: A preflight request from an origin
+        When: An OPTIONS request is made to "/generate"
+        Then: It should allow the origin only if it is in the allowlist.
+        """
+        # Execute
+        response = test_client.options(
+            "/generate",
+            headers={
+                "Origin": origin,
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "Content-Type",
+            },
+        )
 
-        Given: A scenario where file deletion raises an exception
-        When: cleanup_files is called
-        Then: It should log the error but not crash.
+        # Assert
+        assert (response.status_code == 200) is allowed
+        assert (
+            response.headers.get("access-control-allow-origin") == origin
+        ) is allowed
+
+    @patch.dict("api.main.config_manager.config", {"max_concurrency": 3})
+    @patch("api.main.create_discharge_note_generator")
+    def test_lifespan(self, mock_create_generator):
+        """Test the generator's lifecycle.
+
+        Given: An application that has not started
+        When: The application starts and later shuts down
+        Then: It should create and warm up the generator, freeze the config
+            and size the batch semaphore from it, then close the generator.
         """
         # Setup
-        input_path = tmp_path / "input.json"
-        output_path = tmp_path / "output.json"
+        mock_generator = MagicMock(spec=DischargeNoteGenerator)
+        mock_create_generator.return_value = mock_generator
 
-        # Create test file
-        input_path.touch()
+        # Execute
+        with TestClient(app):
+            assert app.state.discharge_generator is mock_generator
+            assert app.state.batch_semaphore._value == 3
+            assert config_manager.frozen
+            mock_generator.warmup.assert_awaited_once()
+            mock_generator.close.assert_not_awaited()
 
-        with patch("pathlib.Path.exists", return_value=True):
-            with patch("pathlib.Path.unlink", side_effect=PermissionError("Access denied")):
-                with patch("api.main.logger") as mock_logger:
-                    from api.main import cleanup_files
+        # Assert
+        mock_generator.close.assert_awaited_once()
 
-                    # Execute
-                    cleanup_files(input_path, output_path)
+    @patch("api.main.logger")
+    @patch("api.main.create_discharge_note_generator")
+    def test_lifespan_warmup_error(self, mock_create_generator, mock_logger):
+        """Test that a failed warm-up does not prevent startup.
 
-                    # Assert
-                    mock_logger.error.assert_called_once()
+        Given: A generator whose warm-up raises an exception
+        When: The application starts
+        Then: It should log a warning and serve requests.
+        """
+        # Setup
+        mock_generator = MagicMock(spec=DischargeNoteGenerator)
+        mock_generator.warmup.side_effect = Exception("Connection error")
+        mock_create_generator.return_value = mock_generator
 
-    def test_main_module(self):
-        """Test the main module execution block.
+        # Execute
+        with TestClient(app) as client:
+            response = client.get("/")
 
-        This test verifies the code inside the if __name__ == "__main__" block is covered.
-        """
-        # Since we can't easily test the actual execution of the main module,
-        # we'll just cover those lines by testing the import in a way that doesn't affect
-        # the actual test
-        import api.main
-        
-        # The lines in the if block are now considered covered for the purpose of this test
-        assert hasattr(api.main, "app"), "FastAPI app should be defined"
-        
-        # This doesn't test the actual functionality, but it ensures the lines are covered
-        assert api.main.__name__ != "__main__", "Module should not be run as __main__ in tests"
+        # Assert
+        assert response.status_code == 200
+        mock_logger.warning.assert_called_once()
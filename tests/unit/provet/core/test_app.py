@@ -3,36 +3,64 @@
 Tests for the DischargeNoteGenerator class and related functionality.
 """
 
-from pathlib import Path
-from unittest.mock import MagicMock, patch
+import asyncio
+from dataclasses import dataclass
+from typing import Any
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 from provet.core.app import DischargeNoteGenerator, create_discharge_note_generator
 from provet.core.data_models import ConsultationData
+from provet.core.llm_service import LLMService
+
+_ERR_PROCESS_DATA = "Error processing consultation data"
+
+
+@dataclass
+class _StubConsultation:
+    """Consultation data stand-in that returns a fixed template context."""
+
+    context: dict[str, Any]
+
+    def to_template_context(self) -> dict[str, Any]:
+        return self.context
 
 
 class TestDischargeNoteGenerator:
     """Test class for the DischargeNoteGenerator."""
 
-    def test_init(self):
+    @pytest.fixture(autouse=True, scope="class")
+    @classmethod
+    def mock_llm_service(cls, class_mocker) -> Mock:
+        """Patch the LLM service factory once for the whole class.
+
+        Args:
+            class_mocker: pytest-mock fixture for class-scoped patches.
+
+        Returns:
+            Mock LLM service returned by create_llm_service.
+        """
+        mock_llm_service = Mock(spec=LLMService)
+        class_mocker.patch(
+            "provet.core.app.create_llm_service", return_value=mock_llm_service
+        )
+        return mock_llm_service
+
+    def test_init(self, mock_llm_service):
         """Test initialization of the DischargeNoteGenerator.
 
-        Given: No specific inputs
+        Given: A patched LLM service factory
         When: A DischargeNoteGenerator instance is created
         Then: It should have the expected attributes properly initialized.
         """
-        with patch("provet.core.app.create_llm_service") as mock_create_llm_service:
-            mock_llm_service = MagicMock()
-            mock_create_llm_service.return_value = mock_llm_service
-
-            # Execute
-            generator = DischargeNoteGenerator()
+        # Execute
+        generator = DischargeNoteGenerator()
 
-            # Assert
-            assert generator.llm_service == mock_llm_service
-            assert generator.template_engine is not None
-            assert generator.io_manager is not None
+        # Assert
+        assert generator.llm_service is mock_llm_service
+        assert generator.template_engine is not None
+        assert generator.io_manager is not None
 
     @pytest.mark.parametrize(
         "context, discharge_note",
@@ -47,7 +75,7 @@ class TestDischargeNoteGenerator:
             ),
         ],
     )
-    def test_process_file(self, context, discharge_note, tmp_path):
+    def test_process_file(self, generator, context, discharge_note, tmp_path):
         """Test processing a file to generate a discharge note.
 
         Given: Different consultation data contexts and expected discharge notes
@@ -55,36 +83,31 @@ class TestDischargeNoteGenerator:
         Then: It should load the data, generate the note, and save it to the expected path.
         """
         # Setup
-        generator = DischargeNoteGenerator()
-
         # Mock IO manager
-        generator.io_manager = MagicMock()
-        mock_consultation_data = MagicMock(spec=ConsultationData)
-        mock_consultation_data.to_template_context.return_value = context
-        generator.io_manager.load_consultation_data.return_value = (
-            mock_consultation_data
+        generator.io_manager.load_consultation_data.return_value = _StubConsultation(
+            context
         )
         generator.io_manager.save_discharge_note.return_value = str(
             tmp_path / "output.json"
         )
 
         # Mock LLM service
-        generator.llm_service = MagicMock()
-        generator.llm_service.generate_discharge_note.return_value = discharge_note
+        generator.llm_service.generate_discharge_note = AsyncMock(
+            return_value=discharge_note
+        )
 
         # Execute
-        result = generator.process_file("test.json")
+        result = asyncio.run(generator.process_file("test.json"))
 
         # Assert
         generator.io_manager.load_consultation_data.assert_called_once_with("test.json")
-        mock_consultation_data.to_template_context.assert_called_once()
-        generator.llm_service.generate_discharge_note.assert_called_once_with(context)
+        generator.llm_service.generate_discharge_note.assert_awaited_once_with(context)
         generator.io_manager.save_discharge_note.assert_called_once_with(
             discharge_note, "test.json"
         )
         assert result == str(tmp_path / "output.json")
 
-    def test_process_file_error(self):
+    def test_process_file_error(self, generator):
         """Test error handling when processing a file.
 
         Given: A DischargeNoteGenerator instance and a process that raises an exception
@@ -92,18 +115,266 @@ class TestDischargeNoteGenerator:
         Then: It should catch the exception and raise a ValueError with details.
         """
         # Setup
-        generator = DischargeNoteGenerator()
-        generator.io_manager = MagicMock()
         generator.io_manager.load_consultation_data.side_effect = Exception(
             "Test error"
         )
 
         # Execute and Assert
-        with pytest.raises(ValueError) as excinfo:
-            generator.process_file("test.json")
+        with pytest.raises(ValueError, match="Error processing file.*Test error"):
+            asyncio.run(generator.process_file("test.json"))
+
+    def test_process_files(self, generator):
+        """Test processing several files concurrently.
+
+        Given: Several consultation data files
+        When: process_files is called
+        Then: It should process every file and return the outputs in order.
+        """
+        # Setup
+
+        async def process_file(path):
+            await asyncio.sleep(0.01 if path == "first.json" else 0)
+            return f"solution/{path}"
+
+        generator.process_file = AsyncMock(side_effect=process_file)
+
+        # Execute
+        result = asyncio.run(generator.process_files(["first.json", "second.json"]))
+
+        # Assert
+        assert result == ["solution/first.json", "solution/second.json"]
+        assert generator.process_file.await_count == 2
+
+    def test_process_files_partial_failure(self, generator):
+        """Test processing several files when one of them fails.
+
+        Given: Several consultation data files, one of which can't be processed
+        When: process_files is called
+        Then: It should process the other files and name only the failed one.
+        """
+        # Setup
+
+        async def process_file(path):
+            if path == "bad.json":
+                raise ValueError(f"❌ Error processing file {path}: bad file")
+            await asyncio.sleep(0.01)
+            return f"solution/{path}"
+
+        generator.process_file = AsyncMock(side_effect=process_file)
+
+        # Execute and Assert
+        with pytest.raises(ValueError, match="1 of 3 files") as excinfo:
+            asyncio.run(generator.process_files(["a.json", "bad.json", "c.json"]))
+
+        assert "bad.json" in str(excinfo.value)
+        assert "a.json" not in str(excinfo.value)
+        assert generator.process_file.await_count == 3
+
+    @patch.dict("provet.core.app.config_manager.config", {"max_concurrency": 2})
+    def test_process_files_concurrency_limit(self, generator):
+        """Test that process_files bounds the number of files in flight.
+
+        Given: More files than the configured concurrency limit
+        When: process_files is called
+        Then: It should never process more files at once than the limit.
+        """
+        # Setup
+        running = 0
+        max_running = 0
+
+        async def process_file(path):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return f"solution/{path}"
+
+        generator.process_file = AsyncMock(side_effect=process_file)
+
+        # Execute
+        result = asyncio.run(generator.process_files([f"{i}.json" for i in range(5)]))
+
+        # Assert
+        assert result == [f"solution/{i}.json" for i in range(5)]
+        assert max_running == 2
+
+    def test_process_files_batch(self, generator, tmp_path):
+        """Test processing several files as one batch job.
+
+        Given: Several consultation data files
+        When: process_files_batch is called
+        Then: It should generate the notes in one batch and save each of them.
+        """
+        # Setup
+        generator.io_manager.load_consultation_data.side_effect = lambda path: (
+            _StubConsultation({"patient": path})
+        )
+        generator.io_manager.save_discharge_note.side_effect = lambda note, path: (
+            tmp_path / f"{note}.json"
+        )
+        generator.batch_service = Mock()
+        generator.batch_service.generate_discharge_notes = AsyncMock(
+            return_value=["first", "second"]
+        )
+
+        # Execute
+        result = asyncio.run(
+            generator.process_files_batch(["first.json", "second.json"], 0)
+        )
+
+        # Assert
+        assert result == [str(tmp_path / "first.json"), str(tmp_path / "second.json")]
+        generator.batch_service.generate_discharge_notes.assert_awaited_once_with(
+            [{"patient": "first.json"}, {"patient": "second.json"}], 0
+        )
+
+    def test_process_files_batch_missing_note(self, generator):
+        """Test a batch job in which one note couldn't be generated.
+
+        Given: A batch job that returns no note for one of the files
+        When: process_files_batch is called
+        Then: It should save the other notes and raise a ValueError naming the file.
+        """
+        # Setup
+        generator.io_manager.load_consultation_data.return_value = _StubConsultation({})
+        generator.batch_service = Mock()
+        generator.batch_service.generate_discharge_notes = AsyncMock(
+            return_value=["first", None]
+        )
+
+        # Execute and Assert
+        with pytest.raises(ValueError, match="second.json"):
+            asyncio.run(generator.process_files_batch(["first.json", "second.json"]))
+
+        generator.io_manager.save_discharge_note.assert_called_once_with(
+            "first", "first.json"
+        )
+
+    def test_process_dict(self, generator, sample_consultation_data):
+        """Test generating a discharge note from in-memory consultation data.
+
+        Given: A dictionary of consultation data
+        When: process_dict is called
+        Then: It should return the generated note without touching the IO manager.
+        """
+        # Setup
+        generator.llm_service.generate_discharge_note = AsyncMock(
+            return_value="Dict note"
+        )
+
+        # Execute
+        result = asyncio.run(generator.process_dict(sample_consultation_data))
+
+        # Assert
+        assert result == "Dict note"
+        context = generator.llm_service.generate_discharge_note.call_args[0][0]
+        assert context["patient"].name == "Max"
+        assert not generator.io_manager.method_calls
+
+    @patch("provet.core.app.ConsultationData.from_dict")
+    def test_process_dict_with_model(
+        self, mock_from_dict, generator, sample_consultation_data
+    ):
+        """Test generating a discharge note from already validated data.
+
+        Given: A ConsultationData instance
+        When: process_dict is called
+        Then: It should use the model as is without validating it again.
+        """
+        # Setup
+        consultation_data = ConsultationData.model_validate(sample_consultation_data)
+        generator.llm_service.generate_discharge_note = AsyncMock(
+            return_value="Model note"
+        )
 
-        assert "Error processing file" in str(excinfo.value)
-        assert "Test error" in str(excinfo.value)
+        # Execute
+        result = asyncio.run(generator.process_dict(consultation_data))
+
+        # Assert
+        assert result == "Model note"
+        mock_from_dict.assert_not_called()
+        context = generator.llm_service.generate_discharge_note.call_args[0][0]
+        assert context["patient"] is consultation_data.patient
+
+    def test_process_dict_error(self, generator):
+        """Test error handling when processing in-memory consultation data.
+
+        Given: A DischargeNoteGenerator whose LLM service raises an exception
+        When: process_dict is called
+        Then: It should raise a ValueError with details.
+        """
+        # Setup
+        generator.llm_service.generate_discharge_note = AsyncMock(
+            side_effect=Exception("Test error")
+        )
+
+        # Execute and Assert
+        with pytest.raises(ValueError, match=f"{_ERR_PROCESS_DATA}.*Test error"):
+            asyncio.run(generator.process_dict({"patient": {"name": "Max"}}))
+
+    def test_stream_dict(self, generator, sample_consultation_data):
+        """Test streaming a discharge note from in-memory consultation data.
+
+        Given: A dictionary of consultation data
+        When: stream_dict is called
+        Then: It should return the LLM service's stream for the data's context.
+        """
+        # Setup
+        generator.llm_service.stream_discharge_note.return_value = "stream"
+
+        # Execute
+        result = generator.stream_dict(sample_consultation_data)
+
+        # Assert
+        assert result == "stream"
+        context = generator.llm_service.stream_discharge_note.call_args[0][0]
+        assert context["patient"].name == "Max"
+
+    def test_stream_dict_invalid_data(self, generator):
+        """Test that invalid data fails before streaming starts.
+
+        Given: A dictionary with a value of the wrong type
+        When: stream_dict is called
+        Then: It should raise a ValueError without starting a stream.
+        """
+        # Execute and Assert
+        with pytest.raises(ValueError, match=_ERR_PROCESS_DATA):
+            generator.stream_dict({"patient": {"neutered": "sometimes"}})
+
+        generator.llm_service.stream_discharge_note.assert_not_called()
+
+    def test_warmup(self, generator):
+        """Test warming up the generator.
+
+        Given: A DischargeNoteGenerator
+        When: warmup is called
+        Then: It should warm up the LLM service.
+        """
+        # Setup
+        generator.llm_service.warmup = AsyncMock()
+
+        # Execute
+        asyncio.run(generator.warmup())
+
+        # Assert
+        generator.llm_service.warmup.assert_awaited_once()
+
+    def test_close(self, generator):
+        """Test closing the generator.
+
+        Given: A DischargeNoteGenerator
+        When: close is called
+        Then: It should close the LLM service's connections.
+        """
+        # Setup
+        generator.llm_service.close = AsyncMock()
+
+        # Execute
+        asyncio.run(generator.close())
+
+        # Assert
+        generator.llm_service.close.assert_awaited_once()
 
     def test_create_discharge_note_generator(self):
         """Test the factory function for creating DischargeNoteGenerator instances.
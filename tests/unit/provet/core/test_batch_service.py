@@ -0,0 +1,214 @@
+"""Unit tests for batch_service.py module.
+
+Tests for the BatchService class with mocked OpenAI Batch API calls.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import orjson
+import pytest
+
+from provet.core.batch_service import (
+    BatchService,
+    create_batch_service,
+    parse_batch_output,
+)
+from provet.core.llm_service import LLMService
+
+
+def _result_line(custom_id, content=None, status_code=200):
+    """Build one line of a batch output file.
+
+    Args:
+        custom_id: Custom ID of the request.
+        content: Generated note, or None for a failed request.
+        status_code: HTTP status of the request.
+
+    Returns:
+        JSON-encoded batch result.
+    """
+    body = {"choices": [{"message": {"role": "assistant", "content": content}}]}
+    return orjson.dumps(
+        {
+            "custom_id": custom_id,
+            "response": {"status_code": status_code, "body": body},
+            "error": None,
+        }
+    )
+
+
+@pytest.fixture
+def llm_service():
+    """Create a mock LLM service with a mock OpenAI client.
+
+    Returns:
+        Mock LLMService whose client answers Batch API calls.
+    """
+    service = Mock(spec=LLMService)
+    service.build_request_body.side_effect = lambda context: {
+        "messages": [{"role": "user", "content": context["patient"]}],
+        "model": "gpt-4o",
+    }
+    service.client = MagicMock()
+    service.client.files.create = AsyncMock(return_value=SimpleNamespace(id="file-in"))
+    service.client.batches.create = AsyncMock(
+        return_value=SimpleNamespace(id="batch-1")
+    )
+    return service
+
+
+class TestParseBatchOutput:
+    """Test class for the parse_batch_output helper."""
+
+    def test_parse_batch_output(self):
+        """Test extracting notes from a batch output file.
+
+        Given: A batch output file with successful, failed and blank lines
+        When: parse_batch_output is called
+        Then: It should return the stripped notes of the successful requests.
+        """
+        # Setup
+        data = b"\n".join(
+            [
+                _result_line("0", " First note \n"),
+                b"",
+                _result_line("1", status_code=500),
+                _result_line("2", "Third note"),
+            ]
+        )
+
+        # Execute
+        result = parse_batch_output(data)
+
+        # Assert
+        assert result == {"0": "First note", "2": "Third note"}
+
+
+class TestBatchService:
+    """Test class for the BatchService."""
+
+    def test_submit_batch(self, llm_service):
+        """Test submitting discharge note requests as a batch.
+
+        Given: Several template contexts
+        When: submit_batch is called
+        Then: It should upload one request per context and start a batch job.
+        """
+        # Setup
+        service = BatchService(llm_service)
+
+        # Execute
+        batch_id = asyncio.run(
+            service.submit_batch([{"patient": "Max"}, {"patient": "Luna"}])
+        )
+
+        # Assert
+        assert batch_id == "batch-1"
+        upload = llm_service.client.files.create.call_args.kwargs
+        assert upload["purpose"] == "batch"
+        requests = [orjson.loads(line) for line in upload["file"][1].splitlines()]
+        assert [request["custom_id"] for request in requests] == ["0", "1"]
+        assert requests[1]["url"] == "/v1/chat/completions"
+        assert requests[1]["body"]["messages"][0]["content"] == "Luna"
+        llm_service.client.batches.create.assert_awaited_once_with(
+            input_file_id="file-in",
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+
+    def test_submit_batch_empty(self, llm_service):
+        """Test submitting a batch without any requests.
+
+        Given: No template contexts
+        When: submit_batch is called
+        Then: It should raise a ValueError without uploading anything.
+        """
+        # Setup
+        service = BatchService(llm_service)
+
+        # Execute and Assert
+        with pytest.raises(ValueError, match="No discharge note requests"):
+            asyncio.run(service.submit_batch([]))
+
+        llm_service.client.files.create.assert_not_called()
+
+    def test_wait_for_batch(self, llm_service):
+        """Test polling a batch until it completes.
+
+        Given: A batch that is in progress before it completes
+        When: wait_for_batch is called
+        Then: It should poll until the batch completes and return it.
+        """
+        # Setup
+        completed = SimpleNamespace(status="completed", output_file_id="file-out")
+        llm_service.client.batches.retrieve = AsyncMock(
+            side_effect=[SimpleNamespace(status="in_progress"), completed]
+        )
+        service = BatchService(llm_service)
+
+        # Execute
+        result = asyncio.run(service.wait_for_batch("batch-1", poll_interval=0))
+
+        # Assert
+        assert result is completed
+        assert llm_service.client.batches.retrieve.await_count == 2
+
+    def test_wait_for_batch_failed(self, llm_service):
+        """Test waiting for a batch that fails.
+
+        Given: A batch that expires
+        When: wait_for_batch is called
+        Then: It should raise a ValueError with the batch status.
+        """
+        # Setup
+        llm_service.client.batches.retrieve = AsyncMock(
+            return_value=SimpleNamespace(status="expired")
+        )
+        service = BatchService(llm_service)
+
+        # Execute and Assert
+        with pytest.raises(ValueError, match="batch-1 expired"):
+            asyncio.run(service.wait_for_batch("batch-1", poll_interval=0))
+
+    def test_generate_discharge_notes(self, llm_service):
+        """Test generating discharge notes through a batch job.
+
+        Given: Several contexts and a batch that completes with one failure
+        When: generate_discharge_notes is called
+        Then: It should return the notes in input order, with None for the failure.
+        """
+        # Setup
+        llm_service.client.batches.retrieve = AsyncMock(
+            return_value=SimpleNamespace(status="completed", output_file_id="file-out")
+        )
+        output = b"\n".join(
+            [_result_line("1", "Luna's note"), _result_line("0", "Max's note")]
+        )
+        llm_service.client.files.content = AsyncMock(
+            return_value=SimpleNamespace(content=output)
+        )
+        service = BatchService(llm_service)
+        contexts = [{"patient": "Max"}, {"patient": "Luna"}, {"patient": "Rex"}]
+
+        # Execute
+        result = asyncio.run(service.generate_discharge_notes(contexts, 0))
+
+        # Assert
+        assert result == ["Max's note", "Luna's note", None]
+        llm_service.client.files.content.assert_awaited_once_with("file-out")
+
+    def test_create_batch_service(self, llm_service):
+        """Test the factory function for creating BatchService instances.
+
+        Given: An LLM service
+        When: create_batch_service is called
+        Then: It should return a BatchService using that LLM service.
+        """
+        # Execute
+        service = create_batch_service(llm_service)
+
+        # Assert
+        assert isinstance(service, BatchService)
+        assert service.llm_service is llm_service
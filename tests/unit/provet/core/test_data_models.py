@@ -3,7 +3,10 @@
 Tests for the data model classes and their functionality.
 """
 
+from operator import attrgetter
+
 import pytest
+from pydantic import ValidationError
 
 from provet.core.data_models import (
     ClinicalNote,
@@ -16,147 +19,148 @@ class TestPatient:
     """Test class for the Patient data model."""
 
     @pytest.mark.parametrize(
-        "name, species, breed, gender, neutered, date_of_birth, weight, microchip",
+        "fields",
         [
-            (
-                "Max",
-                "Dog",
-                "Golden Retriever",
-                "Male",
-                True,
-                "2018-05-10",
-                "32 kg",
-                "123456789012345",
-            ),
-            (
-                "Luna",
-                "Cat",
-                "Maine Coon",
-                "Female",
-                False,
-                "2020-01-15",
-                "4.5 kg",
-                None,
-            ),
-            ("Buddy", "Dog", "Mixed", "Male", True, "2019-03-22", "25 kg", None),
+            {
+                "name": "Max",
+                "species": "Dog",
+                "breed": "Golden Retriever",
+                "gender": "Male",
+                "neutered": True,
+                "date_of_birth": "2018-05-10",
+                "weight": "32 kg",
+                "microchip": "123456789012345",
+            },
+            {
+                "name": "Luna",
+                "species": "Cat",
+                "breed": "Maine Coon",
+                "gender": "Female",
+                "neutered": False,
+                "date_of_birth": "2020-01-15",
+                "weight": "4.5 kg",
+                "microchip": None,
+            },
+            {
+                "name": "Buddy",
+                "species": "Dog",
+                "breed": "Mixed",
+                "gender": "Male",
+                "neutered": True,
+                "date_of_birth": "2019-03-22",
+                "weight": "25 kg",
+                "microchip": None,
+            },
         ],
     )
-    def test_patient_init(
-        self, name, species, breed, gender, neutered, date_of_birth, weight, microchip
-    ):
+    def test_patient_init(self, fields):
         """Test Patient initialization with different parameter values.
 
         Given: Patient attributes
         When: A Patient object is created
         Then: The object should have the correct attributes.
         """
-        patient = Patient(
-            name=name,
-            species=species,
-            breed=breed,
-            gender=gender,
-            neutered=neutered,
-            date_of_birth=date_of_birth,
-            weight=weight,
-            microchip=microchip,
-        )
+        patient = Patient(**fields)
 
-        assert patient.name == name
-        assert patient.species == species
-        assert patient.breed == breed
-        assert patient.gender == gender
-        assert patient.neutered == neutered
-        assert patient.date_of_birth == date_of_birth
-        assert patient.weight == weight
-        assert patient.microchip == microchip
+        assert {attr: getattr(patient, attr) for attr in fields} == fields
 
 
 class TestClinicalNote:
     """Test class for the ClinicalNote data model."""
 
     @pytest.mark.parametrize(
-        "note, note_type, expected_type",
+        "fields, expected",
         [
-            ("Test note", None, "general"),
-            ("Assessment note", "assessment", "assessment"),
-            ("Diagnosis", "diagnosis", "diagnosis"),
+            ({"note": "Test note"}, {"note": "Test note", "type": "general"}),
+            (
+                {"note": "Assessment note", "type": "assessment"},
+                {"note": "Assessment note", "type": "assessment"},
+            ),
+            (
+                {"note": "Diagnosis", "type": "diagnosis"},
+                {"note": "Diagnosis", "type": "diagnosis"},
+            ),
         ],
     )
-    def test_clinical_note_init(self, note, note_type, expected_type):
+    def test_clinical_note_init(self, fields, expected):
         """Test ClinicalNote initialization with different parameter values.
 
         Given: Clinical note attributes
         When: A ClinicalNote object is created
         Then: The object should have the correct attributes with default type if not specified.
         """
-        kwargs = {"note": note}
-        if note_type:
-            kwargs["type"] = note_type
+        clinical_note = ClinicalNote(**fields)
 
-        clinical_note = ClinicalNote(**kwargs)
-
-        assert clinical_note.note == note
-        assert clinical_note.type == expected_type
+        assert {attr: getattr(clinical_note, attr) for attr in expected} == expected
 
 
 class TestConsultationData:
     """Test class for the ConsultationData data model."""
 
-    def test_from_dict(self, sample_consultation_data):
+    @pytest.mark.parametrize(
+        "path, expected",
+        [
+            ("patient.name", "Max"),
+            ("patient.species", "Dog (Canine - Domestic)"),
+            ("patient.breed", "Golden Retriever"),
+            ("patient.gender", "Male"),
+            ("patient.neutered", True),
+            ("patient.date_of_birth", "2018-05-10"),
+            ("patient.weight", "32 kg"),
+            ("patient.microchip", "123456789012345"),
+            ("consultation.date", "2023-07-15"),
+            ("consultation.time", "10:30"),
+            ("consultation.reason", "Vomiting and lethargy"),
+            ("consultation.type", "Outpatient"),
+            (
+                "consultation.clinical_notes.0.note",
+                "Patient presented with vomiting and lethargy for the past 24 hours.",
+            ),
+            ("consultation.clinical_notes.0.type", "general"),
+            (
+                "consultation.treatment_items.procedures.0.name",
+                "Physical examination",
+            ),
+            ("consultation.treatment_items.medicines.0.name", "Cerenia"),
+            ("consultation.treatment_items.prescriptions.0.name", "Metronidazole"),
+            ("consultation.treatment_items.prescriptions.0.duration", "5 days"),
+            ("consultation.diagnostics.0.name", "Complete Blood Count"),
+            ("consultation.diagnostics.0.result", "Within normal limits"),
+        ],
+    )
+    def test_from_dict(self, consultation_data_object, path, expected):
         """Test creation of ConsultationData from a dictionary.
 
-        Given: A dictionary containing consultation data
-        When: ConsultationData.from_dict is called
-        Then: It should return a properly populated ConsultationData object.
+        Given: A ConsultationData object parsed once from sample data
+        When: The field at the given path is read
+        Then: It should hold the value from the dictionary.
         """
-        data = ConsultationData.from_dict(sample_consultation_data)
+        value = consultation_data_object
+        for part in path.split("."):
+            value = value[int(part)] if part.isdigit() else getattr(value, part)
 
-        # Check patient data
-        assert data.patient.name == "Max"
-        assert data.patient.species == "Dog (Canine - Domestic)"
-        assert data.patient.breed == "Golden Retriever"
-        assert data.patient.gender == "Male"
-        assert data.patient.neutered is True
-        assert data.patient.date_of_birth == "2018-05-10"
-        assert data.patient.weight == "32 kg"
-        assert data.patient.microchip == "123456789012345"
-
-        # Check consultation data
-        assert data.consultation.date == "2023-07-15"
-        assert data.consultation.time == "10:30"
-        assert data.consultation.reason == "Vomiting and lethargy"
-        assert data.consultation.type == "Outpatient"
-
-        # Check clinical notes
-        assert len(data.consultation.clinical_notes) == 2
-        assert (
-            data.consultation.clinical_notes[0].note
-            == "Patient presented with vomiting and lethargy for the past 24 hours."
-        )
-        assert data.consultation.clinical_notes[0].type == "general"
+        assert value == expected
 
-        # Check procedures
-        assert len(data.consultation.treatment_items.procedures) == 2
-        assert (
-            data.consultation.treatment_items.procedures[0].name
-            == "Physical examination"
-        )
-
-        # Check medicines
-        assert len(data.consultation.treatment_items.medicines) == 1
-        assert data.consultation.treatment_items.medicines[0].name == "Cerenia"
+    @pytest.mark.parametrize(
+        "path, expected_length",
+        [
+            ("clinical_notes", 2),
+            ("treatment_items.procedures", 2),
+            ("treatment_items.medicines", 1),
+            ("treatment_items.prescriptions", 1),
+            ("diagnostics", 1),
+        ],
+    )
+    def test_from_dict_lists(self, consultation_data_object, path, expected_length):
+        """Test that list fields keep every item from the dictionary.
 
-        # Check prescriptions
-        assert len(data.consultation.treatment_items.prescriptions) == 1
-        assert (
-            data.consultation.treatment_items.prescriptions[0].name == "Metronidazole"
-        )
-        assert data.consultation.treatment_items.prescriptions[0].duration == "5 days"
+        Given: A ConsultationData object parsed once from sample data
+        When: The list at the given path is read
+        Then: It should have as many items as the dictionary.
+        """
+        items = attrgetter(path)(consultation_data_object.consultation)
 
-        # Check diagnostics
-        assert len(data.consultation.diagnostics) == 1
-        assert data.consultation.diagnostics[0].name == "Complete Blood Count"
-        assert data.consultation.diagnostics[0].result == "Within normal limits"
+        assert len(items) == expected_length
 
     def test_from_dict_minimal(self):
         """Test creation of ConsultationData from a minimal dictionary.
@@ -190,11 +194,45 @@ class TestConsultationData:
         assert data.patient.microchip is None
 
         # Check empty lists
-        assert len(data.consultation.clinical_notes) == 0
-        assert len(data.consultation.treatment_items.procedures) == 0
-        assert len(data.consultation.treatment_items.medicines) == 0
-        assert len(data.consultation.treatment_items.prescriptions) == 0
-        assert len(data.consultation.diagnostics) == 0
+        assert not data.consultation.clinical_notes
+        assert not data.consultation.treatment_items.procedures
+        assert not data.consultation.treatment_items.medicines
+        assert not data.consultation.treatment_items.prescriptions
+        assert not data.consultation.diagnostics
+
+    def test_from_dict_ignores_unknown_fields(self):
+        """Test that fields the models don't declare are ignored.
+
+        Given: A dictionary with extra, undeclared fields
+        When: ConsultationData.from_dict is called
+        Then: It should build the object without them.
+        """
+        data = ConsultationData.from_dict(
+            {"patient": {"name": "Rex", "owner": "Jane"}, "invoice": {"total": 10}}
+        )
+
+        assert data.patient.name == "Rex"
+        assert not hasattr(data.patient, "owner")
+
+    def test_from_dict_invalid_type(self):
+        """Test validation of field types.
+
+        Given: A dictionary with a value of the wrong type
+        When: ConsultationData.from_dict is called
+        Then: It should raise a ValidationError.
+        """
+        with pytest.raises(ValidationError):
+            ConsultationData.from_dict({"patient": {"neutered": "sometimes"}})
+
+    def test_models_are_frozen(self, consultation_data_object):
+        """Test that the models are immutable.
+
+        Given: A ConsultationData object
+        When: An attribute is assigned
+        Then: It should raise a ValidationError.
+        """
+        with pytest.raises(ValidationError):
+            consultation_data_object.patient.name = "Rex"
 
     def test_to_template_context(self, consultation_data_object):
         """Test conversion of ConsultationData to template context.
@@ -3,18 +3,36 @@
 Tests for the LLMService class with mocked OpenAI calls.
 """
 
-from unittest.mock import MagicMock, patch
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
 from provet.core.llm_service import LLMService, create_llm_service
+from provet.utils.config import config_manager
 from provet.utils.template_engine import TemplateEngine
 
 
+@pytest.fixture
+def mock_openai_class(monkeypatch) -> MagicMock:
+    """Replace the OpenAI client class with a mock.
+
+    Args:
+        monkeypatch: Pytest fixture for patching attributes.
+
+    Returns:
+        MagicMock standing in for openai.AsyncOpenAI.
+    """
+    mock = MagicMock()
+    monkeypatch.setattr("openai.AsyncOpenAI", mock)
+    return mock
+
+
 class TestLLMService:
     """Test class for the LLMService."""
 
-    @patch("openai.OpenAI")
     def test_llm_service_init(self, mock_openai_class):
         """Test LLMService initialization.
 
@@ -32,8 +50,70 @@ class TestLLMService:
         # Assert
         assert service.client == mock_openai_instance
         assert mock_openai_class.called
+        assert mock_openai_class.call_args.kwargs["max_retries"] == config_manager.get(
+            "max_retries"
+        )
+
+    def test_llm_service_http_client(self, mock_openai_class):
+        """Test that the OpenAI client uses a shared HTTP/2 connection pool.
+
+        Given: An OpenAI API key in config
+        When: A LLMService instance is created and later closed
+        Then: The client should use an HTTP/2 pool that close shuts down.
+        """
+        # Execute
+        service = LLMService()
+
+        # Assert
+        assert isinstance(service.http_client, httpx.AsyncClient)
+        assert service.http_client.timeout == httpx.Timeout(60.0, connect=5.0)
+        assert mock_openai_class.call_args.kwargs["http_client"] is service.http_client
+
+        asyncio.run(service.close())
+        assert service.http_client.is_closed
+
+    def test_llm_service_context_manager(self, mock_openai_class):
+        """Test using the service as an async context manager.
+
+        Given: An OpenAI API key in config
+        When: A LLMService instance is used in an async with block
+        Then: The block should get the service, whose pool is closed on exit.
+        """
+        # Setup
+        service = LLMService()
+
+        async def use_service():
+            async with service as entered:
+                assert entered is service
+                assert not service.http_client.is_closed
+
+        # Execute
+        asyncio.run(use_service())
+
+        # Assert
+        assert service.http_client.is_closed
+
+    def test_warmup(self, mock_openai_class):
+        """Test warming up the OpenAI connection.
+
+        Given: A LLMService instance
+        When: warmup is called
+        Then: It should retrieve the configured model without a completion.
+        """
+        # Setup
+        mock_openai_instance = MagicMock()
+        mock_openai_instance.models.retrieve = AsyncMock()
+        mock_openai_instance.chat.completions.create = AsyncMock()
+        mock_openai_class.return_value = mock_openai_instance
+        service = LLMService()
+
+        # Execute
+        asyncio.run(service.warmup())
+
+        # Assert
+        mock_openai_instance.models.retrieve.assert_awaited_once_with(service.model)
+        mock_openai_instance.chat.completions.create.assert_not_called()
 
-    @patch("openai.OpenAI")
     def test_llm_service_init_with_template_engine(self, mock_openai_class):
         """Test LLMService initialization with a provided template engine.
 
@@ -50,7 +130,6 @@ class TestLLMService:
         # Assert
         assert service.template_engine == mock_template_engine
 
-    @patch("openai.OpenAI")
     def test_generate_discharge_note(
         self, mock_openai_class, mock_template_engine, mock_openai_response
     ):
@@ -64,8 +143,9 @@ class TestLLMService:
         mock_openai_instance = MagicMock()
         mock_openai_class.return_value = mock_openai_instance
 
-        MagicMock()
-        mock_openai_instance.chat.completions.create.return_value = mock_openai_response
+        mock_openai_instance.chat.completions.create = AsyncMock(
+            return_value=mock_openai_response
+        )
 
         context = {"patient": {"name": "Max"}, "consultation": {"reason": "Checkup"}}
 
@@ -77,20 +157,91 @@ class TestLLMService:
         service = LLMService(template_engine=mock_template_engine)
 
         # Execute
-        result = service.generate_discharge_note(context)
+        result = asyncio.run(service.generate_discharge_note(context))
 
         # Assert
         assert mock_template_engine.render_template.call_count == 2
         mock_template_engine.render_template.assert_any_call(
-            "system_message.j2", context
+            "system_message.j2", {"custom_instruction": ""}
         )
         mock_template_engine.render_template.assert_any_call(
             "discharge_prompt.j2", context
         )
 
-        mock_openai_instance.chat.completions.create.assert_called_once()
+        mock_openai_instance.chat.completions.create.assert_awaited_once()
+        messages = mock_openai_instance.chat.completions.create.call_args.kwargs[
+            "messages"
+        ]
+        assert messages[0]["content"] == "System message for test"
+        assert messages[1]["content"] == "User prompt for test"
         assert result == "This is a test discharge note."
 
+    def test_system_message_rendered_once(
+        self, mock_openai_class, mock_template_engine, mock_openai_response
+    ):
+        """Test that the system message is reused across requests.
+
+        Given: An LLM service handling several requests
+        When: generate_discharge_note is called repeatedly
+        Then: It should render the system message only once.
+        """
+        # Setup
+        mock_openai_instance = MagicMock()
+        mock_openai_class.return_value = mock_openai_instance
+        mock_openai_instance.chat.completions.create = AsyncMock(
+            return_value=mock_openai_response
+        )
+
+        service = LLMService(template_engine=mock_template_engine)
+
+        # Execute
+        asyncio.run(service.generate_discharge_note({"patient": {"name": "Max"}}))
+        asyncio.run(service.generate_discharge_note({"patient": {"name": "Luna"}}))
+
+        # Assert
+        system_renders = [
+            c
+            for c in mock_template_engine.render_template.call_args_list
+            if c.args[0] == "system_message.j2"
+        ]
+        assert len(system_renders) == 1
+        first = service._build_messages({"patient": {"name": "Max"}})
+        second = service._build_messages({"patient": {"name": "Luna"}})
+        assert first[0] is second[0]
+        assert first[1] is not second[1]
+
+    def test_settings_read_at_init(
+        self, mock_openai_class, mock_template_engine, mock_openai_response
+    ):
+        """Test that request settings are read when the service is created.
+
+        Given: An LLM service created with the current configuration
+        When: The configuration changes before a request
+        Then: It should keep using the settings it was created with.
+        """
+        # Setup
+        mock_openai_instance = MagicMock()
+        mock_openai_class.return_value = mock_openai_instance
+        mock_openai_instance.chat.completions.create = AsyncMock(
+            return_value=mock_openai_response
+        )
+
+        with patch.dict(
+            config_manager.config,
+            {"model": "gpt-4o", "temperature": 0.2, "max_tokens": 100},
+        ):
+            service = LLMService(template_engine=mock_template_engine)
+
+        # Execute
+        with patch.dict(config_manager.config, {"model": "other-model"}):
+            asyncio.run(service.generate_discharge_note({"patient": {}}))
+
+        # Assert
+        kwargs = mock_openai_instance.chat.completions.create.call_args.kwargs
+        assert kwargs["model"] == "gpt-4o"
+        assert kwargs["temperature"] == 0.2
+        assert kwargs["max_tokens"] == 100
+
     @pytest.mark.parametrize(
         "context",
         [
@@ -99,7 +250,6 @@ class TestLLMService:
             {"patient": {"name": "Buddy"}, "consultation": {"reason": "Injury"}},
         ],
     )
-    @patch("openai.OpenAI")
     def test_generate_discharge_note_parametrized(
         self, mock_openai_class, mock_template_engine, mock_openai_response, context
     ):
@@ -112,19 +262,20 @@ class TestLLMService:
         # Setup
         mock_openai_instance = MagicMock()
         mock_openai_class.return_value = mock_openai_instance
-        mock_openai_instance.chat.completions.create.return_value = mock_openai_response
+        mock_openai_instance.chat.completions.create = AsyncMock(
+            return_value=mock_openai_response
+        )
 
         service = LLMService(template_engine=mock_template_engine)
 
         # Execute
-        result = service.generate_discharge_note(context)
+        result = asyncio.run(service.generate_discharge_note(context))
 
         # Assert
         assert result == "This is a test discharge note."
         # Verify custom instruction was added to context
         assert "custom_instruction" in context
 
-    @patch("openai.OpenAI")
     def test_generate_discharge_note_error(
         self, mock_openai_class, mock_template_engine
     ):
@@ -137,8 +288,8 @@ class TestLLMService:
         # Setup
         mock_openai_instance = MagicMock()
         mock_openai_class.return_value = mock_openai_instance
-        mock_openai_instance.chat.completions.create.side_effect = Exception(
-            "API error"
+        mock_openai_instance.chat.completions.create = AsyncMock(
+            side_effect=Exception("API error")
         )
 
         service = LLMService(template_engine=mock_template_engine)
@@ -146,7 +297,236 @@ class TestLLMService:
 
         # Execute and Assert
         with pytest.raises(Exception) as excinfo:
-            service.generate_discharge_note(context)
+            asyncio.run(service.generate_discharge_note(context))
+
+        assert "Error generating discharge note" in str(excinfo.value)
+
+    @pytest.mark.parametrize(
+        "statuses, expected_requests",
+        [
+            ([429, 429, 200], 3),
+            ([503, 200], 2),
+        ],
+    )
+    def test_generate_discharge_note_retries(
+        self, mock_template_engine, statuses, expected_requests
+    ):
+        """Test that transient OpenAI errors are retried.
+
+        Given: An OpenAI API that fails with transient errors before succeeding
+        When: generate_discharge_note is called
+        Then: It should retry the request and return the generated note.
+        """
+        # Setup
+        responses = iter(statuses)
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            status = next(responses)
+            if status != 200:
+                return httpx.Response(status, headers={"retry-after-ms": "1"})
+            return httpx.Response(200, json=self._completion("Retried note"))
+
+        service = LLMService(template_engine=mock_template_engine)
+        service.client = service.client.with_options(
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+
+        # Execute
+        result = asyncio.run(service.generate_discharge_note({}))
+
+        # Assert
+        assert result == "Retried note"
+        assert len(requests) == expected_requests
+
+    def test_generate_discharge_note_no_retry_on_bad_request(
+        self, mock_template_engine
+    ):
+        """Test that client errors are not retried.
+
+        Given: An OpenAI API that rejects the request as invalid
+        When: generate_discharge_note is called
+        Then: It should fail after a single request.
+        """
+        # Setup
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(400, json={"error": {"message": "Bad request"}})
+
+        service = LLMService(template_engine=mock_template_engine)
+        service.client = service.client.with_options(
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+
+        # Execute and Assert
+        with pytest.raises(Exception, match="Error generating discharge note"):
+            asyncio.run(service.generate_discharge_note({}))
+
+        assert len(requests) == 1
+
+    @staticmethod
+    def _completion(content):
+        """Build a minimal chat completion response body.
+
+        Args:
+            content: Content of the generated message.
+
+        Returns:
+            Dictionary shaped like an OpenAI chat completion.
+        """
+        return {
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4o",
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+        }
+
+    def test_build_request_body(self, mock_openai_class, mock_template_engine):
+        """Test building a chat completion request without sending it.
+
+        Given: A context dictionary
+        When: build_request_body is called
+        Then: It should return the messages and completion settings.
+        """
+        # Setup
+        service = LLMService(template_engine=mock_template_engine)
+        context = {"patient": {"name": "Max"}}
+
+        # Execute
+        body = service.build_request_body(context)
+
+        # Assert
+        assert body["messages"] == service._build_messages(context)
+        assert body["model"] == config_manager.get("model")
+        assert body["max_tokens"] == config_manager.get("max_tokens")
+        mock_openai_class.return_value.chat.completions.create.assert_not_called()
+
+    def test_generate_discharge_note_cached(
+        self, mock_openai_class, mock_template_engine, mock_openai_response
+    ):
+        """Test that identical prompts are answered from the cache.
+
+        Given: A note already generated for the same rendered prompts
+        When: generate_discharge_note is called again
+        Then: It should return the cached note without calling the OpenAI API.
+        """
+        # Setup
+        mock_openai_instance = MagicMock()
+        mock_openai_class.return_value = mock_openai_instance
+        mock_openai_instance.chat.completions.create = AsyncMock(
+            return_value=mock_openai_response
+        )
+
+        service = LLMService(template_engine=mock_template_engine)
+
+        # Execute
+        first = asyncio.run(service.generate_discharge_note({"patient": {}}))
+        second = asyncio.run(service.generate_discharge_note({"patient": {}}))
+
+        # Assert
+        assert first == second == "This is a test discharge note."
+        mock_openai_instance.chat.completions.create.assert_awaited_once()
+
+    @pytest.mark.parametrize(
+        "settings",
+        [
+            {"model": "gpt-4o-mini"},
+            {"temperature": 0.2},
+            {"max_tokens": 100},
+        ],
+    )
+    def test_cache_key_covers_settings(
+        self, mock_openai_class, mock_template_engine, settings
+    ):
+        """Test that the cache key depends on every completion setting.
+
+        Given: Two LLM services whose configuration differs in one setting
+        When: The cache keys for the same prompts are built
+        Then: The keys should differ.
+        """
+        # Setup
+        service = LLMService(template_engine=mock_template_engine)
+        with patch.dict(config_manager.config, settings):
+            other_service = LLMService(template_engine=mock_template_engine)
+        messages = service._build_messages({"patient": {}})
+
+        # Execute
+        key = service._cache_key(messages)
+        other_key = other_service._cache_key(messages)
+
+        # Assert
+        assert key != other_key
+        assert key == service._cache_key(service._build_messages({"patient": {}}))
+
+    def test_stream_discharge_note(self, mock_openai_class, mock_template_engine):
+        """Test streaming a discharge note.
+
+        Given: An OpenAI API that streams the note in chunks
+        When: stream_discharge_note is iterated
+        Then: It should yield each non-empty fragment and cache the full note.
+        """
+
+        # Setup
+        async def chunks():
+            for content in ["Discharge ", None, "note "]:
+                delta = SimpleNamespace(content=content)
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+            yield SimpleNamespace(choices=[])
+
+        mock_openai_instance = MagicMock()
+        mock_openai_class.return_value = mock_openai_instance
+        mock_openai_instance.chat.completions.create = AsyncMock(return_value=chunks())
+
+        service = LLMService(template_engine=mock_template_engine)
+
+        async def collect():
+            return [f async for f in service.stream_discharge_note({"patient": {}})]
+
+        # Execute
+        fragments = asyncio.run(collect())
+        cached = asyncio.run(collect())
+
+        # Assert
+        assert fragments == ["Discharge ", "note "]
+        assert cached == ["Discharge note"]
+        mock_openai_instance.chat.completions.create.assert_awaited_once()
+        assert (
+            mock_openai_instance.chat.completions.create.call_args.kwargs["stream"]
+            is True
+        )
+
+    def test_stream_discharge_note_error(self, mock_openai_class, mock_template_engine):
+        """Test stream_discharge_note handling of errors.
+
+        Given: An OpenAI API that raises an exception
+        When: stream_discharge_note is iterated
+        Then: It should raise an exception with an appropriate message.
+        """
+        # Setup
+        mock_openai_instance = MagicMock()
+        mock_openai_class.return_value = mock_openai_instance
+        mock_openai_instance.chat.completions.create = AsyncMock(
+            side_effect=Exception("API error")
+        )
+
+        service = LLMService(template_engine=mock_template_engine)
+
+        async def collect():
+            return [f async for f in service.stream_discharge_note({"patient": {}})]
+
+        # Execute and Assert
+        with pytest.raises(Exception) as excinfo:
+            asyncio.run(collect())
 
         assert "Error generating discharge note" in str(excinfo.value)
 
@@ -157,7 +537,7 @@ class TestLLMService:
         When: create_llm_service is called
         Then: It should return a properly configured LLMService instance.
         """
-        with patch("openai.OpenAI"):
+        with patch("openai.AsyncOpenAI"):
             # Execute
             service = create_llm_service(mock_template_engine)
 
@@ -0,0 +1,156 @@
+"""Unit tests for response_cache.py module.
+
+Tests for the ResponseCache class and cache key helper.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from provet.core.response_cache import ResponseCache, make_cache_key
+
+
+class TestMakeCacheKey:
+    """Test class for the make_cache_key helper."""
+
+    def test_same_parts_same_key(self):
+        """Test that identical parts produce identical keys.
+
+        Given: The same model and prompts
+        When: make_cache_key is called twice
+        Then: It should return the same key.
+        """
+        assert make_cache_key("gpt-4o", "sys", "prompt") == make_cache_key(
+            "gpt-4o", "sys", "prompt"
+        )
+
+    def test_part_boundaries_are_significant(self):
+        """Test that moving text between parts changes the key.
+
+        Given: Parts whose concatenation is identical
+        When: make_cache_key is called with each split
+        Then: It should return different keys.
+        """
+        assert make_cache_key("ab", "c") != make_cache_key("a", "bc")
+
+    def test_blake2b_fallback(self):
+        """Test key generation without the optional blake3 package.
+
+        Given: blake3 is not installed
+        When: make_cache_key is called
+        Then: It should return a 128-bit BLAKE2b hex digest.
+        """
+        with patch("provet.core.response_cache.blake3", None):
+            key = make_cache_key("gpt-4o", "sys", "prompt")
+            assert key == make_cache_key("gpt-4o", "sys", "prompt")
+
+        assert len(key) == 32
+
+
+class TestResponseCache:
+    """Test class for the ResponseCache."""
+
+    def test_get_miss(self):
+        """Test looking up a key that was never stored.
+
+        Given: An empty in-process cache
+        When: get is called
+        Then: It should return None.
+        """
+        cache = ResponseCache()
+
+        assert asyncio.run(cache.get("missing")) is None
+
+    def test_set_then_get(self):
+        """Test storing and retrieving a note.
+
+        Given: A note stored under a key
+        When: get is called with the same key
+        Then: It should return the note.
+        """
+        cache = ResponseCache()
+
+        asyncio.run(cache.set("key", "note"))
+
+        assert asyncio.run(cache.get("key")) == "note"
+
+    def test_evicts_least_recently_used(self):
+        """Test LRU eviction once the cache is full.
+
+        Given: A cache of size 2 where the first key was read recently
+        When: A third key is stored
+        Then: The least recently used key should be evicted.
+        """
+        cache = ResponseCache(max_size=2)
+
+        async def scenario():
+            await cache.set("a", "note a")
+            await cache.set("b", "note b")
+            await cache.get("a")
+            await cache.set("c", "note c")
+            return [await cache.get(key) for key in ("a", "b", "c")]
+
+        assert asyncio.run(scenario()) == ["note a", None, "note c"]
+
+    def test_clear(self):
+        """Test clearing the in-process tier.
+
+        Given: A cache with a stored note
+        When: clear is called
+        Then: The note should no longer be returned.
+        """
+        cache = ResponseCache()
+        asyncio.run(cache.set("key", "note"))
+
+        cache.clear()
+
+        assert asyncio.run(cache.get("key")) is None
+
+    def test_redis_tier(self):
+        """Test that Redis is used as the second tier.
+
+        Given: A cache backed by a Redis client
+        When: A note is stored and then looked up after clearing the local tier
+        Then: It should write with the TTL and read the note back from Redis.
+        """
+        cache = ResponseCache(ttl=60)
+        cache.redis = AsyncMock()
+        cache.redis.get.return_value = "note"
+
+        asyncio.run(cache.set("key", "note"))
+        cache.clear()
+        result = asyncio.run(cache.get("key"))
+
+        assert result == "note"
+        cache.redis.setex.assert_awaited_once_with("key", 60, "note")
+        cache.redis.get.assert_awaited_once_with("key")
+
+    def test_redis_errors_are_cache_misses(self):
+        """Test that Redis failures don't break generation.
+
+        Given: A Redis client that raises on every call
+        When: set and get are called
+        Then: The errors should be logged and get should fall back to the local tier.
+        """
+        cache = ResponseCache()
+        cache.redis = AsyncMock()
+        cache.redis.get.side_effect = ConnectionError("Redis down")
+        cache.redis.setex.side_effect = ConnectionError("Redis down")
+
+        with patch("provet.core.response_cache.logger") as mock_logger:
+            asyncio.run(cache.set("key", "note"))
+            local_hit = asyncio.run(cache.get("key"))
+            cache.clear()
+            remote_miss = asyncio.run(cache.get("key"))
+
+        assert local_hit == "note"
+        assert remote_miss is None
+        assert mock_logger.warning.call_count == 2
+
+    def test_without_redis_url(self):
+        """Test that Redis is disabled when no URL is configured.
+
+        Given: No Redis URL
+        When: A ResponseCache is created
+        Then: It should only use the in-process tier.
+        """
+        assert ResponseCache(redis_url=None).redis is None
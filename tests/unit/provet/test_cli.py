@@ -3,19 +3,44 @@
 Tests for the command-line interface functionality.
 """
 
+import asyncio
+import subprocess
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from provet.__main__ import main, parse_args
+from provet.__main__ import build_parser, expand_paths, generate, main, parse_args
+from provet.utils.config import config_manager
+
+# These tests change os.environ and the process-wide configuration, so they
+# run together on one xdist worker
+pytestmark = pytest.mark.xdist_group("environment")
+
+
+@pytest.fixture
+def mock_generator(monkeypatch) -> MagicMock:
+    """Replace the discharge note generator factory with a mock generator.
+
+    Args:
+        monkeypatch: Pytest fixture for patching the factory.
+
+    Returns:
+        Mock generator returned by the patched factory.
+    """
+    generator = MagicMock()
+    generator.close = AsyncMock()
+    monkeypatch.setattr(
+        "provet.core.app.create_discharge_note_generator", lambda: generator
+    )
+    return generator
 
 
 class TestCommandLineInterface:
     """Test class for the command-line interface."""
 
-    def test_parse_args_required(self):
+    def test_parse_args_required(self, monkeypatch):
         """Test parsing of required command-line arguments.
 
         Given: Required command-line arguments
@@ -23,17 +48,17 @@ class TestCommandLineInterface:
         Then: It should return the parsed arguments with expected values.
         """
         # Setup
-        test_args = ["provet", "test.json"]
+        monkeypatch.setattr(sys, "argv", ["provet", "test.json"])
 
         # Execute
-        with patch.object(sys, "argv", test_args):
-            args = parse_args()
+        args = parse_args()
 
         # Assert
-        assert args.file == "test.json"
+        assert args.file == ["test.json"]
+        assert args.batch is False
         assert args.output_dir is None
 
-    def test_parse_args_optional(self):
+    def test_parse_args_optional(self, monkeypatch):
         """Test parsing of optional command-line arguments.
 
         Given: Optional command-line arguments
@@ -41,154 +66,262 @@ class TestCommandLineInterface:
         Then: It should return the parsed arguments with expected values.
         """
         # Setup
-        test_args = [
-            "provet",
-            "test.json",
-            "--output-dir",
-            "custom_output",
-        ]
+        monkeypatch.setattr(
+            sys, "argv", ["provet", "test.json", "--output-dir", "custom_output"]
+        )
 
         # Execute
-        with patch.object(sys, "argv", test_args):
-            args = parse_args()
+        args = parse_args()
 
         # Assert
-        assert args.file == "test.json"
+        assert args.file == ["test.json"]
         assert args.output_dir == Path("custom_output")
 
-    @patch("provet.core.app.create_discharge_note_generator")
-    @patch("builtins.print")
-    def test_main_success(self, mock_print, mock_create_generator):
+    def test_build_parser_reused(self):
+        """Test that the argument parser is built only once.
+
+        Given: No specific inputs
+        When: build_parser is called twice
+        Then: It should return the same parser.
+        """
+        assert build_parser() is build_parser()
+
+    def test_main_success(self, monkeypatch, capsys, mock_generator):
         """Test the main function with successful execution.
 
-        Given: Valid command-line arguments and a mock generator
-        When: main is called with mocked components
-        Then: It should exercise the success path.
+        Given: Several consultation files and a mock generator
+        When: main is called
+        Then: It should process the files together and report each output.
         """
-        # Skip this test since we have other tests that achieve the same coverage
-        pytest.skip("Coverage achieved through other tests")
+        # Setup
+        monkeypatch.setattr(sys, "argv", ["provet", "first.json", "second.json"])
+        mock_generator.process_files = AsyncMock(
+            return_value=["solution/first.json", "solution/second.json"]
+        )
 
-    def test_main_execution(self):
-        """Test the __name__ == '__main__' block.
+        # Execute
+        result = main()
+
+        # Assert
+        assert result == 0
+        mock_generator.process_files.assert_awaited_once_with(
+            ["first.json", "second.json"]
+        )
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 2
+        assert "successfully generated" in lines[1]
+        assert "solution/second.json" in lines[1]
+
+    def test_expand_paths(self, tmp_path):
+        """Test replacing directories with their JSON files.
 
-        This test simply verifies that lines are covered by importing the module,
-        rather than trying to test the specific behavior.
+        Given: A file path and a directory with JSON and other files
+        When: expand_paths is called
+        Then: It should keep the file and list the directory's JSON files by name.
         """
-        # This is a more pragmatic approach for coverage
-        import provet.__main__
-        
-        # Just verify the module has the expected attributes
-        assert hasattr(provet.__main__, "main")
-        assert hasattr(provet.__main__, "parse_args")
-        
-        # We're not testing the actual execution, just covering the lines
-        # The previous tests already verify the functionality
-
-    @patch("provet.core.app.create_discharge_note_generator")
-    def test_main_error(self, mock_create_generator):
-        """Test the main function with an error during execution.
+        # Setup
+        for name in ("b.json", "a.json", "notes.txt"):
+            (tmp_path / name).write_text("{}")
 
-        Given: Valid command-line arguments but a generator that raises an exception
-        When: main is called
-        Then: It should print an error message and return 1 (failure).
+        # Execute
+        result = expand_paths(["first.json", str(tmp_path)])
+
+        # Assert
+        assert result == [
+            "first.json",
+            str(tmp_path / "a.json"),
+            str(tmp_path / "b.json"),
+        ]
+
+    def test_main_dir_mode_single_generator(self, monkeypatch, tmp_path):
+        """Test processing a directory with one generator.
+
+        Given: A directory with three consultation files
+        When: main is called with the directory
+        Then: It should create one generator and process all three files with it.
         """
         # Setup
-        test_args = ["provet", "test.json"]
+        file_paths = [str(tmp_path / f"consultation{i}.json") for i in range(3)]
+        for file_path in file_paths:
+            Path(file_path).write_text("{}")
+        generator = MagicMock()
+        generator.process_files = AsyncMock(return_value=file_paths)
+        generator.close = AsyncMock()
+        mock_create_generator = MagicMock(return_value=generator)
+        monkeypatch.setattr(
+            "provet.core.app.create_discharge_note_generator", mock_create_generator
+        )
+        monkeypatch.setattr(sys, "argv", ["provet", str(tmp_path)])
 
-        mock_generator = MagicMock()
-        mock_generator.process_file.side_effect = Exception("Test error")
-        mock_create_generator.return_value = mock_generator
+        # Execute
+        result = main()
+
+        # Assert
+        assert result == 0
+        mock_create_generator.assert_called_once_with()
+        generator.process_files.assert_awaited_once_with(file_paths)
+
+    def test_expand_paths_empty_directory(self, tmp_path):
+        """Test expanding a directory without JSON files.
+
+        Given: A directory containing no JSON files
+        When: expand_paths is called
+        Then: It should raise a ValueError naming the directory.
+        """
+        # Setup
+        (tmp_path / "notes.txt").write_text("")
+
+        # Execute and Assert
+        with pytest.raises(ValueError, match="No JSON files found in"):
+            expand_paths([str(tmp_path)])
+
+    def test_main_empty_directory(self, monkeypatch, capsys, tmp_path):
+        """Test running the CLI on a directory without JSON files.
+
+        Given: An empty directory
+        When: main is called with the directory, in batch mode
+        Then: It should report the error without creating a generator.
+        """
+        # Setup
+        mock_create_generator = MagicMock()
+        monkeypatch.setattr(
+            "provet.core.app.create_discharge_note_generator", mock_create_generator
+        )
+        monkeypatch.setattr(sys, "argv", ["provet", "--batch", str(tmp_path)])
 
         # Execute
-        with patch.object(sys, "argv", test_args):
-            with patch("builtins.print") as mock_print:
-                result = main()
+        result = main()
 
         # Assert
         assert result == 1
-        mock_print.assert_called_once()
-        assert "Error:" in mock_print.call_args[0][0]
+        assert "No JSON files found in" in capsys.readouterr().err
+        mock_create_generator.assert_not_called()
+
+    def test_import_defers_heavy_dependencies(self):
+        """Test that importing the CLI and parsing arguments doesn't import the LLM stack.
+
+        Given: A fresh interpreter
+        When: provet.__main__ is imported and parse_args is called
+        Then: OpenAI and Jinja2 should not have been imported yet.
+        """
+        # Setup
+        code = (
+            "import sys, provet.__main__; "
+            "sys.argv = ['provet', 'test.json']; "
+            "provet.__main__.parse_args(); "
+            "print(any(m in sys.modules for m in ('openai', 'jinja2')))"
+        )
+
+        # Execute
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        # Assert
+        assert result.stdout.strip() == "False"
+
+    def test_generate_closes_generator(self, mock_generator):
+        """Test that generate releases the generator's connections.
 
-    def test_coverage_main_function(self):
-        """Test to ensure coverage of the main function lines.
-        
-        This test is purely for coverage and doesn't test functionality.
+        Given: A generator that fails to process the file
+        When: generate is called
+        Then: It should close the generator before re-raising the error.
         """
-        import provet.__main__
-        import types
-        
-        # Create a special version of the main function that just returns values
-        # to ensure we can cover the lines without actually executing them
-        orig_main = provet.__main__.main
-        
-        # Define a replacement function to hit the needed coverage lines
-        def dummy_main_for_coverage():
-            # Cover lines 51-54
-            args = types.SimpleNamespace(
-                file="test.json",
-                output_dir=None
-            )
-            
-            # Cover lines 60-61
-            fake_output_path = "/fake/path/output.json"
-            print(f"✅ Discharge note successfully generated and saved to {fake_output_path} 📄")
-            
-            # Return success
-            return 0
-        
-        # Temporarily replace the function
-        provet.__main__.main = dummy_main_for_coverage
-        
-        try:
-            # Call our dummy function
-            result = provet.__main__.main()
-            assert result == 0
-        finally:
-            # Restore the original function
-            provet.__main__.main = orig_main
-
-    def test_main_function_remaining_lines(self):
-        """Test to ensure coverage of the main function lines not yet covered.
-        
-        This test is purely for coverage of specific lines (60-61 and 68) and doesn't test functionality.
+        # Setup
+        mock_generator.process_files = AsyncMock(side_effect=Exception("Test error"))
+
+        # Execute and Assert
+        with pytest.raises(Exception, match="Test error"):
+            asyncio.run(generate(["test.json"]))
+
+        mock_generator.close.assert_awaited_once()
+
+    def test_generate_batch(self, mock_generator):
+        """Test generating notes as an OpenAI batch job.
+
+        Given: The batch option
+        When: generate is called
+        Then: It should freeze the config and submit the files as one batch job.
         """
-        # Let's use monkeypatch to directly execute these specific lines
-        import inspect
-        import types
-        from provet.__main__ import main
-        
-        # Get the source code of the main function
-        main_source = inspect.getsource(main)
-        
-        # Create a new function that only executes the specific lines we're missing
-        coverage_function = """
-def coverage_test():
-    # Lines 60-61 from main - just print something like the success message
-    fake_path = "test_output.json"
-    print(f"✅ Discharge note successfully generated and saved to {fake_path} 📄")
-    return 0
-"""
-        
-        # Create a namespace and execute the code to define our function
-        namespace = {}
-        exec(coverage_function, namespace)
-        
-        # Execute our function that covers the missing lines
-        result = namespace["coverage_test"]()
-        assert result == 0
+        # Setup
+        mock_generator.process_files_batch = AsyncMock(
+            return_value=["solution/test_discharge.json"]
+        )
 
-    def test_sys_exit_coverage(self):
-        """Test to cover the __name__ == "__main__" branch (line 68)."""
-        import sys
-        from unittest.mock import patch
-        
-        # Mock sys.exit and __name__ to simulate script execution
-        with patch("sys.exit") as mock_exit:
-            with patch("provet.__main__.__name__", "__main__"):
-                # Need to force a reload to trigger the if __name__ == "__main__" check
-                import importlib
-                import provet.__main__
-                importlib.reload(provet.__main__)
-        
-        # We don't need to verify mock_exit was called,
-        # just that the line got covered
+        # Execute
+        result = asyncio.run(generate(["test.json"], batch=True))
+
+        # Assert
+        assert result == ["solution/test_discharge.json"]
+        mock_generator.process_files_batch.assert_awaited_once_with(["test.json"])
+        mock_generator.process_files.assert_not_called()
+        assert config_manager.frozen
+
+    @pytest.mark.parametrize("as_directory", [False, True])
+    def test_main_partial_failure(
+        self, monkeypatch, capsys, tmp_path, generator, temp_file, as_directory
+    ):
+        """Test that one bad file doesn't discard the notes of the others.
+
+        Given: Two valid consultation files and one invalid file, passed one by
+            one or as their directory
+        When: main is called
+        Then: It should save the valid files' notes and report only the bad file.
+        """
+        # Setup
+        from provet.core.io_manager import IOManager
+
+        input_dir = tmp_path / "consultations"
+        input_dir.mkdir()
+        consultation = temp_file.read_bytes()
+        (input_dir / "a.json").write_bytes(consultation)
+        (input_dir / "bad.json").write_text("not json")
+        (input_dir / "c.json").write_bytes(consultation)
+        solution_dir = tmp_path / "solution"
+        monkeypatch.setitem(config_manager.config, "solution_dir", solution_dir)
+
+        generator.io_manager = IOManager()
+        generator.llm_service.generate_discharge_note.return_value = "Test note"
+        monkeypatch.setattr(
+            "provet.core.app.create_discharge_note_generator", lambda: generator
+        )
+        if as_directory:
+            args = [str(input_dir)]
+        else:
+            args = [str(input_dir / name) for name in ("a.json", "bad.json", "c.json")]
+        monkeypatch.setattr(sys, "argv", ["provet", *args])
+
+        # Execute
+        result = main()
+
+        # Assert
+        assert result == 1
+        assert sorted(path.name for path in solution_dir.iterdir()) == [
+            "a_discharge.json",
+            "c_discharge.json",
+        ]
+        error = capsys.readouterr().err
+        assert "1 of 3 files" in error
+        assert "bad.json" in error
+        assert "a.json" not in error
+
+    def test_main_error(self, monkeypatch, capsys, mock_generator):
+        """Test the main function with an error during execution.
+
+        Given: Valid command-line arguments but a generator that raises an exception
+        When: main is called
+        Then: It should print an error message and return 1 (failure).
+        """
+        # Setup
+        monkeypatch.setattr(sys, "argv", ["provet", "test.json"])
+        mock_generator.process_files = AsyncMock(side_effect=Exception("Test error"))
+
+        # Execute
+        result = main()
+
+        # Assert
+        assert result == 1
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert captured.err.count("\n") == 1
+        assert "Error: Test error" in captured.err
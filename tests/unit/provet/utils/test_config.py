@@ -3,132 +3,193 @@
 Tests for the ConfigurationManager class.
 """
 
-import os
 from pathlib import Path
-from unittest.mock import patch
 
 import pytest
 
 from provet.utils.config import ConfigurationManager
 
+# These tests change os.environ and the process-wide configuration, so they
+# run together on one xdist worker
+pytestmark = pytest.mark.xdist_group("environment")
+
+
+@pytest.fixture(autouse=True, scope="module")
+def no_dotenv():
+    """Keep ConfigurationManager from reading a real .env file.
+
+    Yields:
+        None, restoring load_dotenv after the module's tests.
+    """
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(
+            "provet.utils.config.load_dotenv", lambda *args, **kwargs: False
+        )
+        yield
+
+
+@pytest.fixture
+def config_manager(monkeypatch) -> ConfigurationManager:
+    """Create a ConfigurationManager with only an API key configured.
+
+    Args:
+        monkeypatch: Pytest fixture for patching environment variables.
+
+    Returns:
+        ConfigurationManager instance.
+    """
+    monkeypatch.setenv("OPENAI_API_KEY", "test-api-key")
+    return ConfigurationManager()
+
 
 class TestConfigurationManager:
     """Test class for the ConfigurationManager."""
 
-    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-api-key"})
-    @patch("provet.utils.config.load_dotenv")
-    def test_init_with_env_vars(self, mock_load_dotenv):
-        """Test initialization with environment variables.
+    def test_init_loads_dotenv(self, mocker, monkeypatch):
+        """Test that the .env file fills in settings missing from the environment.
 
-        Given: Environment variables set
+        Given: An API key in the environment and a .env file setting the model
         When: A ConfigurationManager instance is created
-        Then: It should load settings from environment variables.
+        Then: It should load the .env file without overriding the API key.
         """
+        # Setup
+        monkeypatch.setenv("OPENAI_API_KEY", "test-api-key")
+        monkeypatch.delenv("OPENAI_MODEL", raising=False)
+        monkeypatch.delenv("PROVET_SKIP_DOTENV", raising=False)
+        mock_load_dotenv = mocker.patch(
+            "provet.utils.config.load_dotenv",
+            side_effect=lambda override: monkeypatch.setenv(
+                "OPENAI_MODEL", "dotenv-model"
+            ),
+        )
+
         # Execute
         config_manager = ConfigurationManager()
 
         # Assert
+        mock_load_dotenv.assert_called_once_with(override=False)
         assert config_manager.get("api_key") == "test-api-key"
-        assert mock_load_dotenv.called
-
-    @patch.dict(
-        os.environ,
-        {
-            "OPENAI_API_KEY": "test-api-key",
-            "OPENAI_MODEL": "custom-model",
-            "TEMPERATURE": "0.5",
-            "MAX_TOKENS": "1000",
-            "CUSTOM_SYSTEM_INSTRUCTION": "Custom instruction",
-        },
-    )
-    def test_init_with_custom_env_vars(self):
-        """Test initialization with custom environment variables.
+        assert config_manager.get("model") == "dotenv-model"
+
+    def test_skips_dotenv_when_requested(self, mocker, monkeypatch):
+        """Test that PROVET_SKIP_DOTENV skips the search for a .env file.
 
-        Given: Custom environment variables set
+        Given: An API key and PROVET_SKIP_DOTENV in the environment
         When: A ConfigurationManager instance is created
-        Then: It should load the custom settings.
+        Then: It should not load the .env file.
         """
+        # Setup
+        monkeypatch.setenv("OPENAI_API_KEY", "test-api-key")
+        monkeypatch.setenv("PROVET_SKIP_DOTENV", "1")
+        mock_load_dotenv = mocker.patch("provet.utils.config.load_dotenv")
+
         # Execute
-        config_manager = ConfigurationManager()
+        ConfigurationManager()
 
         # Assert
-        assert config_manager.get("api_key") == "test-api-key"
-        assert config_manager.get("model") == "custom-model"
-        assert config_manager.get("temperature") == 0.5
-        assert config_manager.get("max_tokens") == 1000
-        assert config_manager.get("custom_instruction") == "Custom instruction"
-
-    @patch.dict(os.environ, {}, clear=True)  # Clear all environment variables
-    @patch("provet.utils.config.load_dotenv")
-    def test_init_without_api_key(self, mock_load_dotenv):
-        """Test initialization without an API key.
+        assert mock_load_dotenv.called is False
 
-        Given: No OPENAI_API_KEY environment variable
+    def test_skip_dotenv_without_api_key(self, mocker, monkeypatch):
+        """Test skipping the .env file with no API key in the environment.
+
+        Given: PROVET_SKIP_DOTENV set and no API key in the environment
         When: A ConfigurationManager instance is created
-        Then: It should raise a ValueError.
+        Then: It should not load the .env file and raise a ValueError.
         """
-        # Mock load_dotenv to ensure it doesn't load real .env
-        mock_load_dotenv.return_value = False
+        # Setup
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        monkeypatch.setenv("PROVET_SKIP_DOTENV", "1")
+        mock_load_dotenv = mocker.patch("provet.utils.config.load_dotenv")
 
         # Execute and Assert
-        with pytest.raises(ValueError) as excinfo:
+        with pytest.raises(ValueError, match="OPENAI_API_KEY"):
             ConfigurationManager()
-
-        assert "OPENAI_API_KEY environment variable is not set" in str(excinfo.value)
-
-    @patch.dict(
-        os.environ, {"OPENAI_API_KEY": "test-api-key", "OPENAI_MODEL": "gpt-4.1-nano"}
+        assert mock_load_dotenv.called is False
+
+    @pytest.mark.parametrize(
+        "env, expected",
+        [
+            ({"OPENAI_API_KEY": "test-api-key"}, {"api_key": "test-api-key"}),
+            (
+                {
+                    "OPENAI_API_KEY": "test-api-key",
+                    "OPENAI_MODEL": "custom-model",
+                    "TEMPERATURE": "0.5",
+                    "MAX_TOKENS": "1000",
+                    "CUSTOM_SYSTEM_INSTRUCTION": "Custom instruction",
+                },
+                {
+                    "api_key": "test-api-key",
+                    "model": "custom-model",
+                    "temperature": 0.5,
+                    "max_tokens": 1000,
+                    "custom_instruction": "Custom instruction",
+                },
+            ),
+            (
+                {"OPENAI_API_KEY": "test-api-key", "OPENAI_MODEL": "gpt-4.1-nano"},
+                {"api_key": "test-api-key", "model": "gpt-4.1-nano"},
+            ),
+        ],
     )
-    def test_get_existing_key(self):
-        """Test getting an existing configuration key.
+    def test_init_with_env_vars(self, monkeypatch, env, expected):
+        """Test initialization with environment variables.
 
-        Given: A ConfigurationManager with initialized settings
-        When: get is called with an existing key
-        Then: It should return the value for that key.
+        Given: Environment variables set
+        When: A ConfigurationManager instance is created
+        Then: It should load and convert the settings from environment variables.
         """
         # Setup
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+
+        # Execute
         config_manager = ConfigurationManager()
 
+        # Assert
+        assert {key: config_manager.get(key) for key in expected} == expected
+
+    def test_init_without_api_key(self, monkeypatch):
+        """Test initialization without an API key.
+
+        Given: No OPENAI_API_KEY environment variable
+        When: A ConfigurationManager instance is created
+        Then: It should raise a ValueError.
+        """
+        # Setup
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
         # Execute and Assert
-        assert config_manager.get("api_key") == "test-api-key"
-        assert (
-            config_manager.get("model") == "gpt-4.1-nano"
-        )  # Updated to match actual model
+        with pytest.raises(
+            ValueError, match="OPENAI_API_KEY environment variable is not set"
+        ):
+            ConfigurationManager()
 
-    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-api-key"})
-    def test_get_nonexistent_key(self):
+    def test_get_nonexistent_key(self, config_manager):
         """Test getting a non-existent configuration key.
 
         Given: A ConfigurationManager
         When: get is called with a non-existent key
         Then: It should return the default value.
         """
-        # Setup
-        config_manager = ConfigurationManager()
-
         # Execute and Assert
         assert config_manager.get("nonexistent_key") is None
         assert config_manager.get("nonexistent_key", "default") == "default"
 
-    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-api-key"})
-    def test_set(self):
+    def test_set(self, config_manager):
         """Test setting a configuration value.
 
         Given: A ConfigurationManager
         When: set is called with a key and value
         Then: It should update the configuration with the new value.
         """
-        # Setup
-        config_manager = ConfigurationManager()
-
         # Execute
         config_manager.set("new_key", "new_value")
 
         # Assert
         assert config_manager.get("new_key") == "new_value"
 
-    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-api-key"})
-    def test_update(self):
+    def test_update(self, config_manager):
         """Test updating multiple configuration values.
 
         Given: A ConfigurationManager
@@ -136,7 +197,6 @@ class TestConfigurationManager:
         Then: It should update the configuration with all the new values.
         """
         # Setup
-        config_manager = ConfigurationManager()
         new_config = {
             "model": "gpt-4-turbo",
             "temperature": 0.8,
@@ -153,22 +213,45 @@ class TestConfigurationManager:
         # Original values should remain unchanged
         assert config_manager.get("api_key") == "test-api-key"
 
-    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-api-key"})
-    def test_default_paths(self):
+    def test_freeze(self, config_manager):
+        """Test freezing the configuration.
+
+        Given: A ConfigurationManager
+        When: freeze is called
+        Then: Values should stay readable but set and update should fail.
+        """
+        # Setup
+        model = config_manager.get("model")
+
+        # Execute
+        config_manager.freeze()
+
+        # Assert
+        assert config_manager.frozen
+        assert config_manager.get("api_key") == "test-api-key"
+        with pytest.raises(RuntimeError):
+            config_manager.set("model", "gpt-4-turbo")
+        with pytest.raises(RuntimeError):
+            config_manager.update({"model": "gpt-4-turbo"})
+        with pytest.raises(TypeError):
+            config_manager.config["model"] = "gpt-4-turbo"
+        assert config_manager.get("model") == model
+
+    def test_default_paths(self, config_manager):
         """Test default paths in configuration.
 
         Given: A ConfigurationManager with no path overrides
         When: The configuration is accessed
-        Then: It should have valid default paths.
+        Then: It should have valid default paths shared by every instance.
         """
         # Execute
-        config_manager = ConfigurationManager()
-
-        # Assert
         templates_dir = config_manager.get("templates_dir")
         solution_dir = config_manager.get("solution_dir")
 
+        # Assert
         assert isinstance(templates_dir, Path)
         assert isinstance(solution_dir, Path)
         assert templates_dir.name == "templates"
         assert solution_dir.name == "solution"
+        assert ConfigurationManager().get("templates_dir") is templates_dir
+        assert ConfigurationManager().get("solution_dir") is solution_dir
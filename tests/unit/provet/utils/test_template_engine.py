@@ -3,13 +3,21 @@
 Tests for the TemplateEngine class that handles Jinja2 templates.
 """
 
-from pathlib import Path
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import pytest
-from jinja2 import Template, TemplateNotFound
+from jinja2 import FileSystemBytecodeCache, Template, TemplateNotFound
 
-from provet.utils.template_engine import TemplateEngine
+from provet.utils.config import config_manager
+from provet.utils.template_engine import (
+    MiniJinjaTemplateEngine,
+    TemplateEngine,
+    create_template_engine,
+    get_template_engine,
+)
 
 
 class TestTemplateEngine:
@@ -37,6 +45,44 @@ class TestTemplateEngine:
         assert engine.templates_dir == default_dir
         mock_environment.assert_called_once()
 
+    def test_init_caching(self):
+        """Test that compiled templates are cached and all templates preloaded.
+
+        Given: The default templates directory
+        When: A TemplateEngine instance is created
+        Then: It should use a bytecode cache and preload every template.
+        """
+        # Execute
+        engine = TemplateEngine()
+
+        # Assert
+        assert isinstance(engine.env.bytecode_cache, FileSystemBytecodeCache)
+        assert engine.env.auto_reload is False
+        assert set(engine._templates) == {"system_message.j2", "discharge_prompt.j2"}
+        for name in list(engine._templates):
+            engine.env = MagicMock()
+            assert engine.get_template(name).name == name
+            engine.env.get_template.assert_not_called()
+
+    def test_init_cache_dir(self, tmp_path):
+        """Test using a configured directory for compiled templates.
+
+        Given: A jinja_cache_dir that doesn't exist yet
+        When: A TemplateEngine instance is created
+        Then: It should create the directory for the current user only and
+            store compiled templates in it.
+        """
+        # Setup
+        cache_dir = tmp_path / "jinja_cache"
+
+        # Execute
+        with patch.dict(config_manager.config, {"jinja_cache_dir": str(cache_dir)}):
+            TemplateEngine()
+
+        # Assert
+        assert cache_dir.stat().st_mode & 0o777 == 0o700
+        assert len(list(cache_dir.iterdir())) == 2
+
     def test_get_template(self):
         """Test getting a template by name.
 
@@ -57,6 +103,47 @@ class TestTemplateEngine:
         assert result == mock_template
         engine.env.get_template.assert_called_once_with("test_template.j2")
 
+    def test_get_template_memoized(self):
+        """Test that templates are only loaded once.
+
+        Given: A template that wasn't preloaded
+        When: get_template is called twice
+        Then: It should load the template from the environment only once.
+        """
+        # Setup
+        engine = TemplateEngine()
+        mock_template = MagicMock(spec=Template)
+        engine.env = MagicMock()
+        engine.env.get_template.return_value = mock_template
+
+        # Execute
+        first = engine.get_template("test_template.j2")
+        second = engine.get_template("test_template.j2")
+
+        # Assert
+        assert first is second is mock_template
+        engine.env.get_template.assert_called_once_with("test_template.j2")
+
+    def test_get_template_debug(self):
+        """Test that templates are reloaded in debug mode.
+
+        Given: Debug mode is enabled
+        When: get_template is called twice
+        Then: It should go through the auto-reloading environment each time.
+        """
+        # Setup
+        with patch.dict(config_manager.config, {"debug": True}):
+            engine = TemplateEngine()
+        assert engine.env.auto_reload is True
+        engine.env = MagicMock()
+
+        # Execute
+        engine.get_template("system_message.j2")
+        engine.get_template("system_message.j2")
+
+        # Assert
+        assert engine.env.get_template.call_count == 2
+
     def test_get_template_not_found(self):
         """Test error handling when a template is not found.
 
@@ -99,4 +186,140 @@ class TestTemplateEngine:
         # Assert
         assert result == expected_result
         engine.get_template.assert_called_once_with(template_name)
-        mock_template.render.assert_called_once_with(**context)
+        mock_template.render.assert_called_once_with(context)
+
+    def test_render_template_to_stream(self):
+        """Test rendering a template into a stream.
+
+        Given: A template and a text stream
+        When: render_template_to_stream is called
+        Then: It should write the same output as render_template.
+        """
+        # Setup
+        engine = TemplateEngine()
+        context = {"custom_instruction": "Be brief."}
+        sink = io.StringIO()
+
+        # Execute
+        engine.render_template_to_stream("system_message.j2", context, sink)
+
+        # Assert
+        assert sink.getvalue() == engine.render_template("system_message.j2", context)
+        assert "Be brief." in sink.getvalue()
+
+
+class TestMiniJinjaTemplateEngine:
+    """Test class for the MiniJinjaTemplateEngine."""
+
+    def test_matches_jinja2(self, consultation_data_object):
+        """Test that both backends render every template identically.
+
+        Given: Every template in the default directory and sample data
+        When: The templates are rendered with Jinja2 and MiniJinja
+        Then: Both backends should produce the same output.
+        """
+        pytest.importorskip("minijinja")
+
+        # Setup
+        jinja2_engine = TemplateEngine()
+        minijinja_engine = MiniJinjaTemplateEngine()
+        context = consultation_data_object.to_template_context()
+        context["custom_instruction"] = "Be brief."
+
+        # Execute and Assert
+        for name in jinja2_engine.env.list_templates(extensions=["j2"]):
+            assert minijinja_engine.render_template(
+                name, context
+            ) == jinja2_engine.render_template(name, context)
+
+    def test_render_template_to_stream(self):
+        """Test rendering a template into a stream.
+
+        Given: A template and a text stream
+        When: render_template_to_stream is called
+        Then: It should write the rendered template to the stream.
+        """
+        pytest.importorskip("minijinja")
+
+        # Setup
+        engine = MiniJinjaTemplateEngine()
+        context = {"custom_instruction": "Be brief."}
+        sink = io.StringIO()
+
+        # Execute
+        engine.render_template_to_stream("system_message.j2", context, sink)
+
+        # Assert
+        assert sink.getvalue() == engine.render_template("system_message.j2", context)
+
+    def test_requires_minijinja(self):
+        """Test the error when minijinja is not installed.
+
+        Given: minijinja is not installed
+        When: A MiniJinjaTemplateEngine instance is created
+        Then: It should raise an ImportError.
+        """
+        with patch("provet.utils.template_engine.minijinja", None):
+            with pytest.raises(ImportError):
+                MiniJinjaTemplateEngine()
+
+
+class TestCreateTemplateEngine:
+    """Test class for the create_template_engine factory."""
+
+    @pytest.mark.parametrize(
+        "backend,engine_class",
+        [("jinja2", TemplateEngine), ("minijinja", MiniJinjaTemplateEngine)],
+    )
+    def test_backends(self, backend, engine_class):
+        """Test creating an engine for each backend.
+
+        Given: A configured template backend
+        When: create_template_engine is called
+        Then: It should return an engine for that backend.
+        """
+        if backend == "minijinja":
+            pytest.importorskip("minijinja")
+
+        with patch.dict(config_manager.config, {"template_backend": backend}):
+            assert isinstance(create_template_engine(), engine_class)
+
+    def test_unknown_backend(self):
+        """Test creating an engine for an unknown backend.
+
+        Given: An unknown template backend
+        When: create_template_engine is called
+        Then: It should raise a ValueError.
+        """
+        with patch.dict(config_manager.config, {"template_backend": "mako"}):
+            with pytest.raises(ValueError):
+                create_template_engine()
+
+
+class TestGetTemplateEngine:
+    """Test class for the get_template_engine accessor."""
+
+    @patch("provet.utils.template_engine._engine", None)
+    @patch("provet.utils.template_engine.create_template_engine")
+    def test_creates_engine_once(self, mock_create):
+        """Test that the template engine is shared across threads.
+
+        Given: No template engine has been created yet
+        When: get_template_engine is called from several threads
+        Then: It should create one engine and return it to every caller.
+        """
+
+        # Setup
+        def create_slowly():
+            time.sleep(0.01)
+            return MagicMock(spec=TemplateEngine)
+
+        mock_create.side_effect = create_slowly
+
+        # Execute
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            engines = list(executor.map(lambda _: get_template_engine(), range(8)))
+
+        # Assert
+        mock_create.assert_called_once()
+        assert all(engine is engines[0] for engine in engines)